@@ -4,57 +4,154 @@ ProposalSnap - AI Presentation Maker
 Upload your logo, describe your proposal, get a professional PPTX in seconds.
 """
 
-import os, json, uuid, subprocess, colorsys, hashlib, secrets
+import os, re, json, subprocess, hashlib, secrets, threading, select, struct, time, queue, shutil, glob, gzip, logging, posixpath, zipfile, multiprocessing
 import bcrypt, smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from pathlib import Path
 from io import BytesIO
-from functools import wraps
+from html import unescape
+from xml.etree import ElementTree
+from urllib.parse import quote
+from functools import wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueHandler, QueueListener
 
 import anthropic
+import httpx
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 import requests as http_requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+from cachetools import LRUCache, TTLCache
 from PIL import Image
+try:
+    from rcssmin import cssmin
+except ImportError:
+    cssmin = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import minify_html
+except ImportError:
+    minify_html = None
+from palette import compute_palette, default_colors
 from pptx import Presentation as PptxPresentation
 from pptx.util import Inches, Pt
-from flask import Flask, request, jsonify, send_file, render_template, render_template_string, redirect, session, flash
+from flask.json.provider import DefaultJSONProvider
+from flask.logging import default_handler
+from flask import Flask, Response, request, jsonify, send_file, render_template, redirect, session, flash
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify/request.get_json via orjson; types orjson lacks (Decimal, dates) use Flask's default"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS |
+                            orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Run directly (python app.py), this file is re-imported as __mp_main__ in every cpu_pool
+# child; those only need palette.py, so they skip the threads and processes started below
+RUNTIME = __name__ != "__mp_main__"
+
+# Log records are queued and written by a listener thread so request threads never block on stderr
+log_queue = queue.SimpleQueue()
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+if RUNTIME:
+    QueueListener(log_queue, log_handler).start()
+app.logger.removeHandler(default_handler)
+app.logger.addHandler(QueueHandler(log_queue))
+app.logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
 app.secret_key = os.environ.get('SECRET_KEY', 'proposalsnap-prod-2026')
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=90)
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['MAX_CONTENT_LENGTH'] = 20 * 1024 * 1024
+# Downloads: USE_XSENDFILE=1 for Apache/Caddy X-Sendfile; XACCEL_PREFIX (e.g. /protected/)
+# for an nginx `internal` location aliased to outputs/
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_XSENDFILE') == '1'
+XACCEL_PREFIX = os.environ.get('XACCEL_PREFIX', '')
 
 UPLOAD_DIR = Path(__file__).parent / "uploads"
 OUTPUT_DIR = Path(__file__).parent / "outputs"
 UPLOAD_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
+LOGO_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.svg', '.webp')
 
 # ── Database (lightweight — just users + usage tracking) ────────
+# Connections are reused across requests; past DB_POOL_MAX busy ones, get_db falls back to a fresh connect
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', '16'))
+db_pool = None
+db_pool_lock = threading.Lock()
+# Set once init_db has run (or given up), so no request touches the schema mid-migration
+db_ready = threading.Event()
+DB_READY_TIMEOUT = 30
+
+class PooledConnection:
+    """A pooled psycopg2 connection whose close() hands it back to the pool instead of disconnecting"""
+    _conn = None
+
+    def __init__(self, pool, conn):
+        self._pool, self._conn = pool, conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            # One that broke mid-request (server restart, idle timeout) is dropped, not reused
+            self._pool.putconn(conn, close=bool(conn.closed))
+
+    __del__ = close  # paths that raise before close() still return their connection
+
 def get_db():
+    db_ready.wait(DB_READY_TIMEOUT)
+    return connect_db()
+
+def connect_db():
+    global db_pool
     db_url = os.environ.get('DATABASE_URL', '')
     if not db_url:
         return None
     if db_url.startswith('postgres://'):
         db_url = db_url.replace('postgres://', 'postgresql://', 1)
-    conn = psycopg2.connect(db_url, cursor_factory=psycopg2.extras.RealDictCursor)
+    with db_pool_lock:
+        if db_pool is None:
+            db_pool = psycopg2.pool.ThreadedConnectionPool(
+                1, DB_POOL_MAX, db_url, cursor_factory=psycopg2.extras.RealDictCursor,
+                keepalives=1, keepalives_idle=60)
+    try:
+        conn = db_pool.getconn()
+    except psycopg2.pool.PoolError:
+        conn = psycopg2.connect(db_url, cursor_factory=psycopg2.extras.RealDictCursor)
+        conn.autocommit = True
+        return conn
     conn.autocommit = True
-    return conn
+    return PooledConnection(db_pool, conn)
 
 @app.errorhandler(500)
 def handle_500(e):
     import traceback
     tb = traceback.format_exc()
-    print(f"[500 ERROR] {tb}")
+    app.logger.error(f"[500 ERROR] {tb}")
     return f"<pre style='padding:20px;background:#1a1a2e;color:#ff6b6b;font-size:12px'><b>500 Error</b>\n\n{tb}</pre>", 500
 
 def init_db():
     try:
-        conn = get_db()
+        conn = connect_db()
         if not conn: return
         cur = conn.cursor()
         cur.execute('''CREATE TABLE IF NOT EXISTS users (
@@ -106,15 +203,25 @@ def init_db():
             except: conn.rollback()
         conn.commit()
         conn.close()
-        print("✅ Database ready")
-    except Exception as e:
-        print(f"⚠️ DB not available yet: {e}")
+        app.logger.info("Database ready")
+    except Exception:
+        app.logger.exception("Database setup failed")
+    finally:
+        db_ready.set()
 
-init_db()
+# Schema setup/migrations don't hold up worker boot; get_db waits on db_ready until they finish
+if RUNTIME:
+    threading.Thread(target=init_db, daemon=True).start()
+else:
+    db_ready.set()
 
 # ── Auth helpers ────────────────────────────────────────────────
+# bcrypt cost for new hashes (~4x cheaper than the library's 12; OWASP's floor is 10).
+# Existing hashes carry their own cost, so check_pw verifies them unchanged.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '10'))
+
 def hash_pw(pw):
-    return bcrypt.hashpw(pw.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(pw.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 def check_pw(pw, hashed):
     try:
@@ -127,6 +234,14 @@ def check_pw(pw, hashed):
 def generate_otp():
     return f"{secrets.randbelow(900000) + 100000}"
 
+# One keep-alive pool for outbound calls (Resend, the FinanceSnap hub), so repeat calls skip the TLS handshake
+http_session = http_requests.Session()
+http_session.headers['User-Agent'] = 'ProposalSnap'
+http_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=Retry(total=1)))
+
+# How long /api/auth/send-otp waits on Resend before replying; the email still goes out after
+OTP_SEND_WAIT = 2
+
 def send_otp_email(email, code, purpose='login'):
     resend_key = os.environ.get('RESEND_API_KEY', '')
     from_email = os.environ.get('SMTP_FROM', 'noreply@usevarnam.com')
@@ -141,30 +256,28 @@ def send_otp_email(email, code, purpose='login'):
         <p style="color:#999;font-size:11px;margin-top:20px">Part of <a href="https://snapsuite.up.railway.app" style="color:#f59e0b">Varnam Suite</a></p>
     </div>"""
     if not resend_key:
-        print(f"⚠️ RESEND_API_KEY not set. OTP for {email}: {code}")
+        app.logger.warning("RESEND_API_KEY not set; OTP email not sent")
+        app.logger.debug(f"OTP for {email}: {code}")
         return False
-    import requests as http_req
     try:
-        r = http_req.post('https://api.resend.com/emails', json={
+        r = http_session.post('https://api.resend.com/emails', json={
             'from': from_email, 'to': [email], 'subject': subject, 'html': html
         }, headers={'Authorization': f'Bearer {resend_key}'}, timeout=10)
         if r.status_code == 200:
-            print(f"✅ OTP sent to {email}")
+            app.logger.info(f"OTP sent to {email}")
             return True
         else:
-            print(f"❌ Resend error {r.status_code}: {r.text}")
-            print(f"💡 OTP for {email}: {code}")
+            app.logger.error(f"Resend error {r.status_code}: {r.text}")
             return False
-    except Exception as e:
-        print(f"❌ Email failed: {e}")
-        print(f"💡 OTP for {email}: {code}")
+    except Exception:
+        app.logger.exception("OTP email failed")
         return False
 
 
 def register_with_hub(company_name, email, currency):
     hub = os.environ.get('FINANCESNAP_URL', 'https://snapsuite.up.railway.app')
     try:
-        http_requests.post(f'{hub}/api/register-company', json={
+        http_session.post(f'{hub}/api/register-company', json={
             'app_name': 'ProposalSnap', 'company_name': company_name,
             'email': email, 'currency': currency,
             'app_url': 'https://proposalsnap.up.railway.app'
@@ -206,10 +319,10 @@ def login_required(f):
         return f(*args, **kwargs)
     return decorated
 
-def log_usage(title='', slides=0):
-    """Log a generation event for the current user"""
+def log_usage(title='', slides=0, uid=None):
+    """Log a generation event for the current user (pass uid when outside a request)"""
     try:
-        uid = session.get('user_id')
+        uid = uid or session.get('user_id')
         if not uid: return
         conn = get_db()
         if not conn: return
@@ -219,10 +332,10 @@ def log_usage(title='', slides=0):
         conn.close()
     except: pass
 
-def save_proposal(client_name, company_name, pres_type, key_points, num_slides, download_url):
+def save_proposal(client_name, company_name, pres_type, key_points, num_slides, download_url, uid=None):
     """Save generated proposal to proposals table for FinanceSnap integration"""
     try:
-        uid = session.get('user_id')
+        uid = uid or session.get('user_id')
         if not uid: return
         conn = get_db()
         if not conn: return
@@ -237,118 +350,141 @@ def save_proposal(client_name, company_name, pres_type, key_points, num_slides,
     except: pass
 
 MODEL = "claude-sonnet-4-5-20250929"
-client = anthropic.Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY', ''))
+# One pooled HTTP/2 connection set shared by every request thread: concurrent Claude calls
+# multiplex over warm TLS sessions, kept alive between the (sparse) generations
+claude_http = anthropic.DefaultHttpxClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=8, keepalive_expiry=120),
+    timeout=httpx.Timeout(120, connect=5),
+)
+# Retries are done in claude_create so they can back off outside the semaphore
+client = anthropic.Anthropic(api_key=os.environ.get('ANTHROPIC_API_KEY', ''), max_retries=0,
+                             http_client=claude_http)
+
+# Cap in-flight Claude calls per process to stay under the account's rate limits
+CLAUDE_CONCURRENCY = int(os.environ.get('CLAUDE_CONCURRENCY', '8'))
+claude_slots = threading.BoundedSemaphore(CLAUDE_CONCURRENCY)
+CLAUDE_ATTEMPTS = 3
+
+def claude_create(**kwargs):
+    """client.messages.create behind the concurrency cap, retrying transient failures (1s, 2s backoff)"""
+    for attempt in range(CLAUDE_ATTEMPTS):
+        try:
+            with claude_slots:
+                return client.messages.create(**kwargs)
+        except (anthropic.APIConnectionError, anthropic.RateLimitError, anthropic.InternalServerError) as e:
+            if attempt == CLAUDE_ATTEMPTS - 1:
+                raise
+            app.logger.warning(f"Claude call failed ({type(e).__name__}), retrying")
+            time.sleep(2 ** attempt)
+
+# Threads for overlapping blocking I/O (Claude calls) with other request work
+io_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('IO_THREADS', '16')))
+
+# Background /api/generate jobs; separate from io_pool because they block on io_pool futures
+job_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('JOB_THREADS', '8')))
+
+# OTP emails and hub registration; their own pool so they never queue behind Claude calls
+notify_pool = ThreadPoolExecutor(max_workers=4)
+
+# Processes for CPU-bound logo decoding/color math; children start on first use.
+# forkserver, not fork: this process is multi-threaded by then (pools, log listener,
+# PPTX reader pipes), and children import only palette.py
+CPU_WORKERS = int(os.environ.get('CPU_WORKERS', max(2, (os.cpu_count() or 2) - 1)))
+cpu_context = multiprocessing.get_context("forkserver")
+cpu_context.set_forkserver_preload(["palette"])  # the server imports just this, not __main__
+cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=cpu_context)
 
 # ── Color Extraction ──────────────────────────────────────────
-def extract_colors_from_logo(logo_path):
-    """Extract dominant colors from logo and generate a visually balanced palette"""
+def extract_colors_from_logo(logo):
+    """Extract dominant colors from logo (a path, raw bytes, or an upload stream) and generate a visually balanced palette"""
     try:
-        img = Image.open(logo_path).convert("RGB")
-        img = img.resize((100, 100))
-        pixels = list(img.getdata())
-        
-        # Filter out near-white, near-black, and very desaturated pixels
-        filtered = []
-        for r, g, b in pixels:
-            h, s, v = colorsys.rgb_to_hsv(r/255, g/255, b/255)
-            if s > 0.15 and 0.1 < v < 0.95:
-                filtered.append((r, g, b, h, s, v))
-        
-        if len(filtered) < 10:
-            filtered = [(r, g, b, *colorsys.rgb_to_hsv(r/255, g/255, b/255)) 
-                       for r, g, b in pixels 
-                       if not (r > 240 and g > 240 and b > 240) 
-                       and not (r < 15 and g < 15 and b < 15)]
-        
-        if not filtered:
-            return default_colors()
-        
-        # Pick the most vivid color as primary
-        filtered.sort(key=lambda p: p[4] * p[5], reverse=True)
-        best = filtered[0]
-        r, g, b = best[0], best[1], best[2]
-        h, s, v = best[3], best[4], best[5]
-        
-        # Ensure primary is rich enough for headings
-        ps = max(0.5, s)
-        pv = max(0.35, min(0.75, v))
-        pr, pg, pb = colorsys.hsv_to_rgb(h, ps, pv)
-        primary_hex = f"{int(pr*255):02x}{int(pg*255):02x}{int(pb*255):02x}"
-        
-        # Secondary: very light tint of primary (for backgrounds)
-        sr, sg, sb = colorsys.hsv_to_rgb(h, max(0.05, s * 0.15), min(1.0, 0.92 + v * 0.06))
-        secondary_hex = f"{int(sr*255):02x}{int(sg*255):02x}{int(sb*255):02x}"
-        
-        # Accent: shifted hue for visual interest, rich saturation
-        ah = (h + 0.55) % 1.0  # complementary hue
-        avs = max(0.5, min(0.9, s))
-        avv = max(0.45, min(0.85, v * 1.1))
-        ar, ag, ab = colorsys.hsv_to_rgb(ah, avs, avv)
-        accent_hex = f"{int(ar*255):02x}{int(ag*255):02x}{int(ab*255):02x}"
-        
-        # Dark: very dark version for backgrounds
-        dr, dg, db = colorsys.hsv_to_rgb(h, min(0.5, s * 0.6), 0.12)
-        dark_hex = f"{int(dr*255):02x}{int(dg*255):02x}{int(db*255):02x}"
-        
-        return {
-            "primary": primary_hex,
-            "secondary": secondary_hex,
-            "accent": accent_hex,
-            "dark": dark_hex,
-            "light": "F8F9FA",
-            "textDark": "1A1A2E",
-            "textLight": "FFFFFF",
-            "textMuted": "6B7280"
-        }
-    except Exception as e:
-        print(f"Color extraction error: {e}")
+        if isinstance(logo, bytes):
+            data = logo
+        elif hasattr(logo, 'read'):
+            data = logo.read()
+        else:
+            data = Path(logo).read_bytes()
+        # Copy so callers can apply manual overrides without touching the cache
+        return dict(_palette_from_bytes(data))
+    except Exception:
+        app.logger.exception("Color extraction error")
         return default_colors()
 
-def default_colors():
-    return {
-        "primary": "1E2761", "secondary": "CADCFC", "accent": "4A90D9",
-        "dark": "0F1629", "light": "F8F9FA", "textDark": "1A1A2E",
-        "textLight": "FFFFFF", "textMuted": "6B7280"
-    }
+# Below this many pixels (favicons etc.) the math is cheaper than the cpu_pool round trip
+TINY_LOGO_PIXELS = 10_000
+
+# Palettes by logo content hash: memory first, then a small JSON file per logo on disk
+# that survives restarts and is shared by workers, so a logo is decoded once, ever
+palette_cache = LRUCache(maxsize=128)
+palette_cache_lock = threading.Lock()
+PALETTE_CACHE_DIR = OUTPUT_DIR / "palette_cache"
+PALETTE_CACHE_DIR.mkdir(exist_ok=True)
+
+def _palette_from_bytes(data):
+    """Palette for raw logo bytes, memoized on the content hash (re-uploads are free)"""
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    with palette_cache_lock:
+        palette = palette_cache.get(key)
+    if palette is not None:
+        return palette
+    cache_path = PALETTE_CACHE_DIR / f"{key}.json"
+    try:
+        palette = orjson.loads(cache_path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        palette = _decode_and_compute_palette(data)
+        # Write to a temp name then rename, so other workers never read a partial file
+        tmp_path = cache_path.with_suffix(f".{secrets.token_hex(4)}.tmp")
+        tmp_path.write_bytes(orjson.dumps(palette))
+        os.replace(tmp_path, cache_path)
+    with palette_cache_lock:
+        palette_cache[key] = palette
+    return palette
+
+def _decode_and_compute_palette(data):
+    """compute_palette inline for tiny images, otherwise in a cpu_pool process"""
+    global cpu_pool
+    with Image.open(BytesIO(data)) as img:  # header only
+        if img.width * img.height < TINY_LOGO_PIXELS:
+            return compute_palette(data)
+    try:
+        return cpu_pool.submit(compute_palette, data).result(timeout=5)
+    except BrokenProcessPool:
+        # A child died (OOM on a hostile image, etc.) — replace the pool for the next upload
+        cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS, mp_context=cpu_context)
+        raise
 
 # ── Claude API ────────────────────────────────────────────────
-def generate_slide_content(client_name, company_name, pres_type, tone, key_points, num_slides=12):
-    """Use Claude to generate structured slide content"""
-    prompt = f"""Generate a professional {pres_type} presentation structure with STRONG visual variety.
-
-Client: {client_name}
-Presenting Company: {company_name}
-Tone: {tone}
-Number of Slides: {num_slides}
-
-Key Points / Requirements:
-{key_points}
-
-Return ONLY a valid JSON array of slide objects. Each slide MUST have these fields:
-- "layout": one of the layouts below
-- "title": slide title
-- Additional fields based on layout:
-
-AVAILABLE LAYOUTS:
+# Layout catalogue shared by the generate and polish prompts
+LAYOUT_SPEC = """AVAILABLE LAYOUTS:
 
 "title": Opening slide. Fields: subtitle (string)
 "agenda": Overview of what's covered. Fields: bullets (array of 5-7 strings)
 "content": Standard text slide. Fields: bullets (array of 3-5 strings) OR body (paragraph), optional subtitle
 "two_column": Side-by-side comparison. Fields: left_title, left_bullets (array), right_title, right_bullets (array)
-"stats": Big number metrics (2-4 cards). Fields: stats (array of {{value, label, description}})
-"timeline": Process/timeline steps. Fields: steps (array of {{phase, description, duration}})
-"packages": Tier/option cards. Fields: tiers (array of {{name, features[], highlight bool}})
-"team": Team member cards. Fields: members (array of {{name, role, bio}})
-"icon_grid": 4-6 feature/service cards with icons. Fields: items (array of {{icon, heading, description}}). icon should be a single emoji.
-"comparison": Before vs After or comparison table. Fields: left_label, right_label, rows (array of {{feature, left_value, right_value}})
+"stats": Big number metrics (2-4 cards). Fields: stats (array of {value, label, description})
+"timeline": Process/timeline steps. Fields: steps (array of {phase, description, duration})
+"packages": Tier/option cards. Fields: tiers (array of {name, features[], highlight bool})
+"team": Team member cards. Fields: members (array of {name, role, bio})
+"icon_grid": 4-6 feature/service cards with icons. Fields: items (array of {icon, heading, description}). icon should be a single emoji.
+"comparison": Before vs After or comparison table. Fields: left_label, right_label, rows (array of {feature, left_value, right_value})
 "quote": Testimonial or key statement. Fields: quote (string), attribution (string), role (string)
-"metric_bar": Horizontal progress bars. Fields: metrics (array of {{label, value, max_value, description}}). value and max_value are numbers (e.g. value:85, max_value:100)
-"process_flow": Numbered process with arrows. Fields: steps (array of {{number, title, description}})
+"metric_bar": Horizontal progress bars. Fields: metrics (array of {label, value, max_value, description}). value and max_value are numbers (e.g. value:85, max_value:100)
+"process_flow": Numbered process with arrows. Fields: steps (array of {number, title, description})
 "checklist": Visual checklist/deliverables. Fields: items (array of strings), subtitle (string)
-"infographic": Visual data storytelling slide with icons and short facts. Fields: items (array of {{icon, stat, label}}). icon is a single emoji, stat is a short value or word, label is a brief description.
+"infographic": Visual data storytelling slide with icons and short facts. Fields: items (array of {icon, stat, label}). icon is a single emoji, stat is a short value or word, label is a brief description.
 "big_statement": One powerful sentence in large text. Fields: statement (string), supporting_text (string)
 "closing": Thank you slide. Fields: subtitle, contact (string)
+"""
+
+# Fixed part of the slide-generation prompt. It goes first and is marked
+# cacheable so Anthropic's prompt cache can reuse it across requests.
+GENERATE_INSTRUCTIONS = """Call the emit_slides tool with an array of slide objects. Each slide MUST have these fields:
+- "layout": one of the layouts below
+- "title": slide title
+- Additional fields based on layout:
 
+""" + LAYOUT_SPEC + """
 RULES:
 1. If generating 4+ slides: First slide MUST be "title", second MUST be "agenda", last MUST be "closing"
 2. If generating 1-3 slides: Use the most impactful layouts. For 1 slide use "big_statement" or "content". For 2-3 slides, start with "title" and use visual layouts for the rest. No agenda or closing needed.
@@ -359,23 +495,273 @@ RULES:
 7. Stats should have realistic, specific numbers
 8. Bullets should be concise (10-20 words each)
 9. Make content specific to the client and key points
-10. Return ONLY the JSON array, no other text
+10. Put every slide in the emit_slides call, no other text"""
+
+SLIDE_LAYOUTS = ["title", "agenda", "content", "two_column", "stats", "timeline", "packages", "team",
+                 "icon_grid", "comparison", "quote", "metric_bar", "process_flow", "checklist",
+                 "infographic", "big_statement", "closing"]
+_strings = {"type": "array", "items": {"type": "string"}}
+_objects = {"type": "array", "items": {"type": "object"}}
+
+# Forced tool call: the SDK hands back the slides already parsed, no fences to strip
+SLIDES_TOOL = {
+    "name": "emit_slides",
+    "description": "Emit the presentation's slides in order.",
+    "input_schema": {
+        "type": "object",
+        "properties": {"slides": {"type": "array", "items": {
+            "type": "object",
+            "properties": {
+                "layout": {"type": "string", "enum": SLIDE_LAYOUTS},
+                "title": {"type": "string"},
+                "subtitle": {"type": "string"}, "body": {"type": "string"}, "bullets": _strings,
+                "left_title": {"type": "string"}, "left_bullets": _strings,
+                "right_title": {"type": "string"}, "right_bullets": _strings,
+                "stats": _objects, "steps": _objects, "tiers": _objects, "members": _objects,
+                "metrics": _objects, "rows": _objects,
+                "items": {"type": "array"},  # strings for checklist, objects for icon_grid/infographic
+                "left_label": {"type": "string"}, "right_label": {"type": "string"},
+                "quote": {"type": "string"}, "attribution": {"type": "string"}, "role": {"type": "string"},
+                "statement": {"type": "string"}, "supporting_text": {"type": "string"},
+                "contact": {"type": "string"},
+            },
+            "required": ["layout", "title"],
+        }}},
+        "required": ["slides"],
+    },
+}
+
+def slide_content_params(client_name, company_name, pres_type, tone, key_points, num_slides=12):
+    """messages.create params for slide generation (shared by the sync and batch paths)"""
+    prompt = f"""Generate a professional {pres_type} presentation structure with STRONG visual variety.
+
+Client: {client_name}
+Presenting Company: {company_name}
+Tone: {tone}
+Number of Slides: {num_slides}
+
+Key Points / Requirements:
+{key_points}
 
 Generate exactly {num_slides} slides."""
 
-    response = client.messages.create(
-        model=MODEL, max_tokens=4000,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    text = response.content[0].text.strip()
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        text = text.rsplit("```", 1)[0]
-    return json.loads(text)
+    return {
+        "model": MODEL, "max_tokens": 4000,
+        # Cache breakpoint on the system block covers tools + instructions (well over the 1024-token minimum)
+        "system": [{"type": "text", "text": GENERATE_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}}],
+        "messages": [{"role": "user", "content": prompt}],
+        "tools": [SLIDES_TOOL],
+        "tool_choice": {"type": "tool", "name": "emit_slides"},
+    }
+
+# A ```json ... ``` wrapper; the closing fence is optional since a truncated reply never wrote it
+FENCE_RE = re.compile(r"```[^\n]*\n(.*?)(?:```[^`]*)?\Z", re.S)
+
+def prompt_json(obj):
+    """Indented JSON for embedding in a prompt (orjson; non-ASCII stays as-is, not \\u escapes)"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+def parse_json_array(text):
+    """JSON array from a Claude text reply; a reply cut off at max_tokens keeps its complete items"""
+    text = text.strip()
+    if fenced := FENCE_RE.match(text):
+        text = fenced.group(1)
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        items = salvage_json_array(text)
+        if not items:
+            raise
+        app.logger.warning(f"Salvaged {len(items)} items from truncated JSON")
+        return items
+
+def salvage_json_array(text):
+    """Top-level objects of a JSON array that closed cleanly before the text was cut off"""
+    items = []
+    depth, in_str, escaped, obj_start = 0, False, False, None
+    for i in range(text.find("[") + 1, len(text)) if "[" in text else ():
+        ch = text[i]
+        if in_str:
+            if escaped: escaped = False
+            elif ch == "\\": escaped = True
+            elif ch == '"': in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch in "{[":
+            if depth == 0: obj_start = i
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0 and obj_start is not None:
+                try: items.append(orjson.loads(text[obj_start:i + 1]))
+                except orjson.JSONDecodeError: pass
+                obj_start = None
+            elif depth < 0:
+                break  # end of the outer array
+    return items
+
+def slides_from_message(message):
+    """Slide list from the emit_slides tool call in a Claude message"""
+    call = next((block for block in message.content if block.type == "tool_use"), None)
+    if call is None:
+        raise ValueError("Claude returned no slides. Please try again.")
+    return call.input["slides"]
+
+# Fields a slide of each layout needs to render (per LAYOUT_SPEC); "a|b" means either will do
+SLIDE_REQUIRED_FIELDS = {
+    "title": ("subtitle",), "agenda": ("bullets",), "content": ("bullets|body",),
+    "two_column": ("left_bullets", "right_bullets"), "stats": ("stats",), "timeline": ("steps",),
+    "packages": ("tiers",), "team": ("members",), "icon_grid": ("items",),
+    "comparison": ("left_label", "right_label", "rows"), "quote": ("quote",), "metric_bar": ("metrics",),
+    "process_flow": ("steps",), "checklist": ("items",), "infographic": ("items",),
+    "big_statement": ("statement",), "closing": ("subtitle|contact",),
+}
+
+def slide_is_complete(slide):
+    """True when a slide has its title and every field its layout needs"""
+    return bool(slide.get("title")) and all(
+        any(slide.get(field) for field in required.split("|"))
+        for required in SLIDE_REQUIRED_FIELDS.get(slide["layout"], ()))
+
+def continue_truncated_slides(params, response, num_slides):
+    """Keep the slides Claude finished before max_tokens and ask for only the rest (cached prefix)"""
+    call = next((block for block in response.content if block.type == "tool_use"), None)
+    if call is None:
+        # Ran out before emit_slides even started: nothing to keep, so ask again from scratch
+        app.logger.warning("Slide generation truncated before any slides, retrying")
+        return slides_from_message(claude_create(**params, extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}))
+    slides = [s for s in (call.input or {}).get("slides", []) if isinstance(s, dict) and s.get("layout")]
+    if slides and not slide_is_complete(slides[-1]):
+        slides = slides[:-1]  # the slide being written when tokens ran out
+    if len(slides) >= num_slides:
+        return slides[:num_slides]
+    app.logger.warning(f"Slide generation truncated after {len(slides)} slides, requesting the rest")
+    follow_up = dict(params, messages=params["messages"] + [
+        {"role": "assistant", "content": [{"type": "tool_use", "id": call.id, "name": call.name,
+                                           "input": {"slides": slides}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": call.id,
+                                      "content": f"Received slides 1-{len(slides)}. Call emit_slides again "
+                                                 f"with only slides {len(slides) + 1}-{num_slides}."}]},
+    ])
+    rest = slides_from_message(claude_create(**follow_up, extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}))
+    return slides + rest[:num_slides - len(slides)]
+
+# Identical inputs (re-clicks after a logo tweak) reuse the slides instead of another 15-30s call.
+# Memory first, then a per-entry file on disk that survives restarts and is shared by workers.
+slide_cache = LRUCache(maxsize=256)
+slide_cache_lock = threading.Lock()
+SLIDE_CACHE_DIR = OUTPUT_DIR / "slide_cache"
+SLIDE_CACHE_DIR.mkdir(exist_ok=True)
+# Disk entries older than this are pruned (checked at most hourly per process, on write)
+SLIDE_CACHE_MAX_AGE = 7 * 86400
+slide_cache_pruned_at = 0.0
+
+def slide_cache_key(key_points, *fields):
+    """Digest of the generation inputs; key_points ignores case and whitespace, other fields are
+    taken verbatim since names are pasted into the slides as typed"""
+    normalized = [" ".join(key_points.lower().split()), *(str(f) for f in fields)]
+    return hashlib.blake2b(orjson.dumps(normalized), digest_size=16).hexdigest()
+
+def prune_slide_cache():
+    """Delete disk cache entries (and stray temp files) past SLIDE_CACHE_MAX_AGE"""
+    global slide_cache_pruned_at
+    now = time.time()
+    if now - slide_cache_pruned_at < 3600:
+        return
+    slide_cache_pruned_at = now
+    for path in SLIDE_CACHE_DIR.iterdir():
+        try:
+            if now - path.stat().st_mtime > SLIDE_CACHE_MAX_AGE:
+                path.unlink()
+        except FileNotFoundError:
+            pass  # another worker pruned it first
+
+def generate_slide_content(client_name, company_name, pres_type, tone, key_points, num_slides=12, use_cache=True):
+    """Use Claude to generate structured slide content"""
+    key = slide_cache_key(key_points, client_name, company_name, pres_type, tone, num_slides)
+    cache_path = SLIDE_CACHE_DIR / f"{key}.json"
+    if use_cache:
+        with slide_cache_lock:
+            slides = slide_cache.get(key)
+        if slides is not None:
+            return slides
+        try:
+            slides = orjson.loads(cache_path.read_bytes())
+            with slide_cache_lock:
+                slide_cache[key] = slides
+            return slides
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            pass
+    
+    params = slide_content_params(client_name, company_name, pres_type, tone, key_points, num_slides)
+    if use_cache:
+        params["temperature"] = 0  # cached answers should be the ones a re-run would give
+    response = claude_create(**params, extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"})
+    if response.stop_reason == "max_tokens":
+        slides = continue_truncated_slides(params, response, num_slides)
+    else:
+        slides = slides_from_message(response)
+    with slide_cache_lock:
+        slide_cache[key] = slides
+    # Write to a temp name then rename, so other workers never read a partial file
+    tmp_path = cache_path.with_suffix(f".{secrets.token_hex(4)}.tmp")
+    tmp_path.write_bytes(orjson.dumps(slides))
+    os.replace(tmp_path, cache_path)
+    prune_slide_cache()
+    return slides
 
 # ── Extract slides from uploaded PPTX ──────────────────────────
+# OOXML namespaces, for reading slide text straight out of the .pptx zip
+PML = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+DML = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+OFFICE_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
 def extract_slides_from_pptx(filepath):
     """Extract text content from each slide of an uploaded PPTX"""
+    try:
+        return _slides_from_pptx_xml(filepath)
+    except Exception:
+        # Anything unusual in the package: let python-pptx make sense of it
+        return _slides_from_pptx_objects(filepath)
+
+def _pptx_paragraph_text(p):
+    """python-pptx's _Paragraph.text for an <a:p>: runs and fields joined, <a:br> as \\v"""
+    return "".join("\v" if child.tag == DML + "br" else child.findtext(DML + "t") or ""
+                   for child in p if child.tag in (DML + "r", DML + "fld", DML + "br"))
+
+def _slides_from_pptx_xml(filepath):
+    """extract_slides_from_pptx via zipfile + ElementTree, skipping python-pptx's object graph"""
+    with zipfile.ZipFile(filepath) as z:
+        rels = ElementTree.fromstring(z.read("ppt/_rels/presentation.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(PACKAGE_REL + "Relationship")}
+        presentation = ElementTree.fromstring(z.read("ppt/presentation.xml"))
+        slides = []
+        for i, sld_id in enumerate(presentation.iterfind(f"{PML}sldIdLst/{PML}sldId")):
+            target = targets[sld_id.get(OFFICE_REL + "id")]
+            part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("ppt", target))
+            tree = ElementTree.fromstring(z.read(part)).find(f"{PML}cSld/{PML}spTree")
+            slide_data = {"slide_number": i + 1, "texts": []}
+            # Top-level shapes only, like python-pptx's slide.shapes (group contents aren't visited)
+            for shape in tree if tree is not None else ():
+                if shape.tag == PML + "sp":
+                    for p in shape.iterfind(f"{PML}txBody/{DML}p"):
+                        text = _pptx_paragraph_text(p).strip()
+                        if text:
+                            slide_data["texts"].append(text)
+                elif shape.tag == PML + "graphicFrame":
+                    table = shape.find(f"{DML}graphic/{DML}graphicData/{DML}tbl")
+                    if table is not None:
+                        slide_data["table"] = [
+                            ["\n".join(_pptx_paragraph_text(p) for p in tc.iterfind(f"{DML}txBody/{DML}p")).strip()
+                             for tc in tr.iterfind(DML + "tc")]
+                            for tr in table.iterfind(DML + "tr")]
+            if slide_data["texts"] or slide_data.get("table"):
+                slides.append(slide_data)
+        return slides
+
+def _slides_from_pptx_objects(filepath):
+    """extract_slides_from_pptx via python-pptx"""
     prs = PptxPresentation(filepath)
     slides = []
     for i, slide in enumerate(prs.slides):
@@ -397,46 +783,15 @@ def extract_slides_from_pptx(filepath):
             slides.append(slide_data)
     return slides
 
-def polish_slide_content(original_slides, instructions, num_slides=None, tone="Corporate"):
-    """Use Claude to polish/improve existing slide content"""
-    slides_text = json.dumps(original_slides, indent=2)
-    if num_slides is None:
-        num_slides = len(original_slides)
-
-    prompt = f"""You are a presentation expert. I have an existing presentation with the following slide content:
-
-{slides_text}
-
-USER'S INSTRUCTIONS FOR POLISHING:
-{instructions}
-
-Take the existing content and POLISH it according to the user's instructions.
+# Fixed part of the polish prompt (system block, cacheable); the deck and instructions follow as the user turn
+POLISH_INSTRUCTIONS = """You are a presentation expert polishing an existing deck.
 
 Return ONLY a valid JSON array of slide objects. Each slide MUST have these fields:
 - "layout": one of the layouts below
 - "title": slide title
 - Additional fields based on layout:
 
-AVAILABLE LAYOUTS:
-
-"title": Opening slide. Fields: subtitle (string)
-"agenda": Overview of what's covered. Fields: bullets (array of 5-7 strings)
-"content": Standard text slide. Fields: bullets (array of 3-5 strings) OR body (paragraph), optional subtitle
-"two_column": Side-by-side comparison. Fields: left_title, left_bullets (array), right_title, right_bullets (array)
-"stats": Big number metrics (2-4 cards). Fields: stats (array of {{value, label, description}})
-"timeline": Process/timeline steps. Fields: steps (array of {{phase, description, duration}})
-"packages": Tier/option cards. Fields: tiers (array of {{name, features[], highlight bool}})
-"team": Team member cards. Fields: members (array of {{name, role, bio}})
-"icon_grid": 4-6 feature/service cards with icons. Fields: items (array of {{icon, heading, description}}). icon should be a single emoji.
-"comparison": Before vs After or comparison table. Fields: left_label, right_label, rows (array of {{feature, left_value, right_value}})
-"quote": Testimonial or key statement. Fields: quote (string), attribution (string), role (string)
-"metric_bar": Horizontal progress bars. Fields: metrics (array of {{label, value, max_value, description}}). value and max_value are numbers.
-"process_flow": Numbered process with arrows. Fields: steps (array of {{number, title, description}})
-"checklist": Visual checklist/deliverables. Fields: items (array of strings), subtitle (string)
-"infographic": Visual data storytelling slide with icons and short facts. Fields: items (array of {{icon, stat, label}}). icon is a single emoji, stat is a short value or word, label is a brief description.
-"big_statement": One powerful sentence in large text. Fields: statement (string), supporting_text (string)
-"closing": Thank you slide. Fields: subtitle, contact (string)
-
+""" + LAYOUT_SPEC + """
 RULES:
 1. PRESERVE the original content and meaning — polish, don't rewrite from scratch
 2. Apply the user's specific instructions (tone changes, additions, restructuring, etc.)
@@ -445,19 +800,32 @@ RULES:
 5. For 1-3 slides: Use the most impactful layouts, no need for title/closing wrapper
 6. Use as many different layout types as possible for visual variety
 7. Keep bullets concise (10-20 words each)
-8. Generate exactly {num_slides} slides
-9. Tone: {tone}
-10. Return ONLY the JSON array, no other text"""
+8. Generate exactly the number of slides asked for, in the tone asked for
+9. Return ONLY the JSON array, no other text"""
+
+def polish_slide_content(original_slides, instructions, num_slides=None, tone="Corporate"):
+    """Use Claude to polish/improve existing slide content"""
+    slides_text = prompt_json(original_slides)
+    if num_slides is None:
+        num_slides = len(original_slides)
+
+    prompt = f"""I have an existing presentation with the following slide content:
+
+{slides_text}
+
+USER'S INSTRUCTIONS FOR POLISHING:
+{instructions}
+
+Take the existing content and POLISH it according to the user's instructions.
+Generate exactly {num_slides} slides. Tone: {tone}"""
 
-    response = client.messages.create(
+    response = claude_create(
         model=MODEL, max_tokens=4000,
-        messages=[{"role": "user", "content": prompt}]
+        system=[{"type": "text", "text": POLISH_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}}],
+        messages=[{"role": "user", "content": prompt}],
+        extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
     )
-    text = response.content[0].text.strip()
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        text = text.rsplit("```", 1)[0]
-    return json.loads(text)
+    return parse_json_array(response.content[0].text)
 
 # ── Brand Management ───────────────────────────────────────────
 def get_user_brand():
@@ -496,29 +864,29 @@ def apply_brand(colors, logo_path, font_style):
     return colors, logo_path, font_style
 
 # ── Audience Versioning ───────────────────────────────────────
+AUDIENCES = {
+    "executive": {
+        "desc": "C-suite executives with limited time",
+        "rules": "Maximum 6-8 slides. Lead with conclusion/recommendation. Use stats and big statements. Cut all technical details. Every slide must be answerable in 30 seconds.",
+        "default_slides": 6
+    },
+    "detailed": {
+        "desc": "Team members and managers who need full context",
+        "rules": "12-16 slides. Include all details, process flows, timelines, and supporting data. Use a mix of visual layouts. Keep the narrative comprehensive.",
+        "default_slides": 14
+    },
+    "investor": {
+        "desc": "Investors and board members evaluating opportunity",
+        "rules": "8-10 slides. Follow: Problem → Solution → Market → Traction → Model → Team → Ask. Make numbers and metrics prominent. Include comparison/competitive landscape. End with clear ask/next steps.",
+        "default_slides": 10
+    }
+}
+
 def generate_audience_version(original_slides, audience_type, num_slides):
     """Generate a version of the deck targeted at a specific audience"""
-    slides_text = json.dumps(original_slides, indent=2)
-
-    audiences = {
-        "executive": {
-            "desc": "C-suite executives with limited time",
-            "rules": "Maximum 6-8 slides. Lead with conclusion/recommendation. Use stats and big statements. Cut all technical details. Every slide must be answerable in 30 seconds.",
-            "default_slides": 6
-        },
-        "detailed": {
-            "desc": "Team members and managers who need full context",
-            "rules": "12-16 slides. Include all details, process flows, timelines, and supporting data. Use a mix of visual layouts. Keep the narrative comprehensive.",
-            "default_slides": 14
-        },
-        "investor": {
-            "desc": "Investors and board members evaluating opportunity",
-            "rules": "8-10 slides. Follow: Problem → Solution → Market → Traction → Model → Team → Ask. Make numbers and metrics prominent. Include comparison/competitive landscape. End with clear ask/next steps.",
-            "default_slides": 10
-        }
-    }
+    slides_text = prompt_json(original_slides)
 
-    cfg = audiences.get(audience_type, audiences["detailed"])
+    cfg = AUDIENCES.get(audience_type, AUDIENCES["detailed"])
     slide_count = num_slides or cfg["default_slides"]
 
     prompt = f"""You are a presentation expert creating a version of a deck for: {cfg["desc"]}
@@ -543,15 +911,11 @@ RULES:
 4. Keep bullets concise (10-20 words)
 5. Return ONLY the JSON array"""
 
-    response = client.messages.create(
+    response = claude_create(
         model=MODEL, max_tokens=4000,
         messages=[{"role": "user", "content": prompt}]
     )
-    text = response.content[0].text.strip()
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        text = text.rsplit("```", 1)[0]
-    return json.loads(text)
+    return parse_json_array(response.content[0].text)
 
 # ── Style Transfer ────────────────────────────────────────────
 def extract_style_from_pptx(filepath):
@@ -592,8 +956,8 @@ def extract_style_from_pptx(filepath):
 
 def style_transfer_content(content_slides, style_info, instructions=""):
     """Apply extracted style patterns to content"""
-    content_text = json.dumps(content_slides, indent=2)
-    style_text = json.dumps(style_info, indent=2)
+    content_text = prompt_json(content_slides)
+    style_text = prompt_json(style_info)
 
     prompt = f"""You are a presentation design expert. Apply the STYLE from a reference deck to the CONTENT of another deck.
 
@@ -627,24 +991,19 @@ RULES:
 6. Use at LEAST 5 different layout types
 7. Return ONLY the JSON array"""
 
-    response = client.messages.create(
+    response = claude_create(
         model=MODEL, max_tokens=4000,
         messages=[{"role": "user", "content": prompt}]
     )
-    text = response.content[0].text.strip()
-    if text.startswith("```"):
-        text = text.split("\n", 1)[1] if "\n" in text else text[3:]
-        text = text.rsplit("```", 1)[0]
-    return json.loads(text)
+    return parse_json_array(response.content[0].text)
 
 # ── PPTX Generation ───────────────────────────────────────────
 def create_pptx(slides, colors, client_name, company_name, pres_type, tone, logo_path=None, font_style='aptos'):
     """Generate PPTX using Node.js pptxgenjs"""
-    output_id = str(uuid.uuid4())[:8]
+    output_id = secrets.token_hex(4)
     output_path = str(OUTPUT_DIR / f"proposal_{output_id}.pptx")
     
     input_data = {
-        "outputPath": output_path,
         "clientName": client_name,
         "companyName": company_name,
         "presentationType": pres_type,
@@ -655,32 +1014,140 @@ def create_pptx(slides, colors, client_name, company_name, pres_type, tone, logo
         "fontStyle": font_style
     }
     
-    script_path = Path(__file__).parent / "generate_pptx.js"
+    # Borrow an idle worker; with all of them busy, wait for one to come back
+    worker = pptx_workers.get()
+    try:
+        result, data = worker.call(input_data)
+    finally:
+        pptx_workers.put(worker)
+    if not result.get("ok"):
+        raise Exception(f"PPTX generation failed: {result.get('error')}")
     
-    # Find node binary
-    import shutil
+    # The disk copy is what history links, other gunicorn workers and X-Accel/X-Sendfile
+    # serve, so it's in place (temp name, then rename: never partial) before the URL goes out
+    tmp_path = Path(output_path).with_suffix(f".{secrets.token_hex(4)}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, output_path)
+    # This worker serves the first download straight from memory
+    with pptx_cache_lock:
+        pptx_cache[Path(output_path).name] = data
+    return output_path
+
+def find_node_bin():
+    """Locate the node binary (PATH first, then common install and Nix store paths)"""
     node_bin = shutil.which("node")
     if not node_bin:
         # Try common paths
         for p in ["/usr/bin/node", "/usr/local/bin/node", "/nix/store/*/bin/node"]:
-            import glob
             matches = glob.glob(p)
             if matches:
                 node_bin = matches[0]
                 break
     if not node_bin:
+        app.logger.warning("node binary not found — PPTX generation will fail")
         node_bin = "node"
-    
-    result = subprocess.run(
-        [node_bin, str(script_path)],
-        input=json.dumps(input_data),
-        capture_output=True, text=True, timeout=30
-    )
-    
-    if result.returncode != 0:
-        raise Exception(f"PPTX generation failed: {result.stderr}")
-    
-    return output_path
+    return node_bin
+
+# Resolved once at import; the /nix/store glob can stat thousands of entries
+NODE_BIN = find_node_bin()
+
+class PptxWorker:
+    """Persistent `node pptx_worker.js` process fed length-prefixed JSON frames"""
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self.proc = None
+        self.reply_fd = None
+        self.lock = threading.Lock()
+
+    def _start(self):
+        script_path = Path(__file__).parent / "pptx_worker.js"
+        
+        # Replies come back on a dedicated pipe; the worker's stdout/stderr stay ours for logs
+        read_fd, write_fd = os.pipe()
+        try:
+            self.proc = subprocess.Popen([NODE_BIN, str(script_path), str(write_fd)],
+                                         stdin=subprocess.PIPE, pass_fds=(write_fd,), bufsize=0)
+        except:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        self.reply_fd = read_fd
+
+    def _kill(self):
+        if self.proc:
+            try:
+                self.proc.kill()
+                self.proc.wait(timeout=5)
+            except:
+                pass
+            os.close(self.reply_fd)
+        self.proc = None
+
+    def warm(self):
+        """Boot the Node process ahead of the first job so that deck doesn't pay startup + require()"""
+        with self.lock:
+            if self.proc is None:
+                try:
+                    self._start()
+                except OSError:
+                    app.logger.exception("PPTX worker failed to start; will retry on first job")
+
+    def _read_exact(self, n, deadline):
+        buf = b""
+        fd = self.reply_fd
+        while len(buf) < n:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError("PPTX worker timed out")
+            chunk = os.read(fd, n - len(buf))
+            if not chunk:
+                raise EOFError("PPTX worker exited")
+            buf += chunk
+        return buf
+
+    def _read_frame(self, deadline):
+        size = struct.unpack(">I", self._read_exact(4, deadline))[0]
+        return self._read_exact(size, deadline)
+
+    def call(self, payload):
+        """Send one job, return (status, pptx_bytes); restarts the worker on any failure"""
+        body = orjson.dumps(payload)
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._kill()
+                self._start()
+            try:
+                self.proc.stdin.write(struct.pack(">I", len(body)) + body)
+                deadline = time.monotonic() + self.timeout
+                result = orjson.loads(self._read_frame(deadline))
+                data = self._read_frame(deadline) if result.get("ok") else None
+                return result, data
+            except Exception:
+                self._kill()
+                raise
+
+# A few workers per gunicorn process so concurrent requests don't queue on
+# one Node process; each boots at import (Popen doesn't wait), loading
+# pptxgenjs while the process is still idle
+PPTX_WORKERS = int(os.environ.get('PPTX_WORKERS', '2'))
+pptx_workers = queue.Queue()
+
+def start_pptx_workers():
+    """Boot and warm PPTX_WORKERS Node processes into pptx_workers"""
+    for _ in range(PPTX_WORKERS):
+        worker = PptxWorker()
+        worker.warm()
+        pptx_workers.put(worker)
+
+if RUNTIME:
+    start_pptx_workers()
+
+PPTX_MIMETYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# Freshly generated decks by download filename, so download() skips the disk
+pptx_cache = TTLCache(maxsize=64, ttl=600)
+pptx_cache_lock = threading.Lock()
 
 # ── API Routes ────────────────────────────────────────────────
 @app.route('/api/generate', methods=['POST'])
@@ -698,18 +1165,30 @@ def generate():
         if not client_name: return jsonify({"error": "Client name is required"}), 400
         if not key_points: return jsonify({"error": "Key points are required"}), 400
         
-        # Handle logo
+        # ?mode=batch: queue on the Message Batches API (half price, minutes not seconds)
+        batch_mode = request.args.get('mode') == 'batch'
+        
+        # Start Claude right away; logo handling below runs while it's in flight
+        if not batch_mode:
+            slides_future = io_pool.submit(generate_slide_content, client_name, company_name,
+                                           pres_type, tone, key_points, num_slides,
+                                           use_cache=request.args.get('no_cache') != '1')
+        
+        # Handle logo — prefer the copy already saved by /api/preview-colors
         logo_path = None
         colors = default_colors()
-        if 'logo' in request.files and request.files['logo'].filename:
+        saved_logo = find_saved_logo(request.form.get('logo_id', ''))
+        if saved_logo:
+            logo_path = saved_logo
+            if logo_path.suffix != '.svg':
+                colors = extract_colors_from_logo(str(logo_path))
+        elif 'logo' in request.files and request.files['logo'].filename:
             logo_file = request.files['logo']
             logo_ext = Path(logo_file.filename).suffix.lower()
-            if logo_ext in ('.png', '.jpg', '.jpeg', '.svg', '.webp'):
-                logo_id = str(uuid.uuid4())[:8]
-                logo_path = UPLOAD_DIR / f"logo_{logo_id}{logo_ext}"
-                logo_file.save(str(logo_path))
+            if logo_ext in LOGO_EXTENSIONS:
+                logo_path, logo_data = save_logo(logo_file)
                 if logo_ext != '.svg':
-                    colors = extract_colors_from_logo(str(logo_path))
+                    colors = extract_colors_from_logo(logo_data)
         
         # Manual color overrides
         manual_primary = request.form.get('color_primary', '').strip().lstrip('#')
@@ -719,31 +1198,187 @@ def generate():
         if manual_accent and len(manual_accent) == 6:
             colors['accent'] = manual_accent
         
-        # Generate content with Claude
-        slides = generate_slide_content(client_name, company_name, pres_type, tone, key_points, num_slides)
+        if batch_mode:
+            colors, logo_path, font_style = apply_brand(colors, logo_path, font_style)
+            job_id = secrets.token_hex(4)
+            batch = client.beta.messages.batches.create(
+                requests=[{"custom_id": job_id, "params": slide_content_params(
+                    client_name, company_name, pres_type, tone, key_points, num_slides)}],
+                betas=["prompt-caching-2024-07-31"])
+            save_job(job_id, {
+                "batch_id": batch.id, "client_name": client_name, "company_name": company_name,
+                "pres_type": pres_type, "tone": tone, "key_points": key_points, "font_style": font_style,
+                "colors": colors, "logo_path": str(logo_path) if logo_path else None,
+                "num_slides": num_slides, "uid": session.get('user_id'),
+            })
+            return jsonify({"success": True, "batch_id": job_id,
+                            "status_url": f"/api/batch-status/{job_id}"}), 202
         
         # Apply saved brand if no custom logo/colors provided
         colors, logo_path, font_style = apply_brand(colors, logo_path, font_style)
         
-        # Generate PPTX
+        # Claude + PPTX finish in the background; the page polls /api/status/<job_id>
+        job_id = secrets.token_hex(4)
+        save_job(job_id, {"status": "processing"})
+        job_pool.submit(run_generation, job_id, slides_future, colors, logo_path, font_style,
+                        session.get('user_id'), client_name, company_name, pres_type, tone, key_points)
+        return jsonify({"success": True, "job_id": job_id, "status_url": f"/api/status/{job_id}"}), 202
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# ── Jobs ──────────────────────────────────────────────────────
+# Job state lives in small JSON files so any gunicorn worker can answer a poll
+JOB_DIR = OUTPUT_DIR / "jobs"
+JOB_DIR.mkdir(exist_ok=True)
+# A claim older than this belongs to a worker that died mid-build (gunicorn's timeout is 120s)
+JOB_CLAIM_STALE = 300
+# Message batches can take up to 24h, so a pending job must outlive that before it is dropped
+JOB_MAX_AGE = 2 * 86400
+jobs_pruned_at = 0.0
+
+def prune_jobs():
+    """Delete job files, claim markers and stray temp files past JOB_MAX_AGE"""
+    global jobs_pruned_at
+    now = time.time()
+    if now - jobs_pruned_at < 3600:
+        return
+    jobs_pruned_at = now
+    for path in JOB_DIR.iterdir():
+        try:
+            if now - path.stat().st_mtime > JOB_MAX_AGE:
+                path.unlink()
+        except FileNotFoundError:
+            pass  # another worker pruned it first
+
+def save_job(job_id, job):
+    # Write then rename so a concurrent poll never reads a half-written file
+    tmp_path = JOB_DIR / f"{job_id}.{secrets.token_hex(4)}.tmp"
+    tmp_path.write_bytes(orjson.dumps(job))
+    os.replace(tmp_path, JOB_DIR / f"{job_id}.json")
+    prune_jobs()
+
+def load_job(job_id):
+    """Pending/finished job by id, or None"""
+    if len(job_id) != 8 or any(c not in '0123456789abcdef' for c in job_id):
+        return None
+    path = JOB_DIR / f"{job_id}.json"
+    return orjson.loads(path.read_bytes()) if path.exists() else None
+
+def claim_job(job_id):
+    """Take the right to finish a job across all gunicorn workers (O_EXCL marker file); False if taken"""
+    marker = JOB_DIR / f"{job_id}.building"
+    for _ in range(2):
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - marker.stat().st_mtime < JOB_CLAIM_STALE:
+                    return False
+                marker.unlink()  # stale: its owner died, so try once more
+            except FileNotFoundError:
+                pass
+    return False
+
+def release_job(job_id):
+    (JOB_DIR / f"{job_id}.building").unlink(missing_ok=True)
+
+def run_generation(job_id, slides_future, colors, logo_path, font_style, uid,
+                   client_name, company_name, pres_type, tone, key_points):
+    """Background half of /api/generate: wait for Claude, build the deck, record the result"""
+    job = {"status": "processing"}
+    try:
+        slides = slides_future.result()
         output_path = create_pptx(slides, colors, client_name, company_name, pres_type, tone, logo_path, font_style)
-        
-        filename = f"{client_name.replace(' ', '_')}_{pres_type.replace(' ', '_')}.pptx"
-        log_usage(title=f"{client_name} — {pres_type}", slides=len(slides))
         download_url = f"/api/download/{Path(output_path).name}"
-        save_proposal(client_name, company_name, pres_type, key_points, len(slides), download_url)
-        return jsonify({
-            "success": True,
-            "download_url": download_url,
-            "filename": filename,
-            "slides_count": len(slides),
-            "colors": colors
-        })
+        log_usage(title=f"{client_name} — {pres_type}", slides=len(slides), uid=uid)
+        save_proposal(client_name, company_name, pres_type, key_points, len(slides), download_url, uid=uid)
+        job.update(download_url=download_url, slides_count=len(slides), colors=colors,
+                   filename=f"{client_name.replace(' ', '_')}_{pres_type.replace(' ', '_')}.pptx")
+    except json.JSONDecodeError:
+        job["error"] = "Failed to generate slide content. Please try again."
+    except Exception as e:
+        job["error"] = str(e)
+    save_job(job_id, job)
+
+@app.route('/api/status/<job_id>')
+def job_status(job_id):
+    """Poll a background /api/generate job"""
+    job = load_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if not (job.get("download_url") or job.get("error")):
+        return jsonify({"status": "processing"})
+    return jsonify(job_response(job))
+
+@app.route('/api/batch-status/<job_id>')
+def batch_status(job_id):
+    """Poll a ?mode=batch generation; builds the deck once Anthropic has the content"""
+    try:
+        job = load_job(job_id)
+        if not job:
+            return jsonify({"error": "Batch not found"}), 404
+        if job.get("download_url") or job.get("error"):
+            return jsonify(job_response(job))
+        
+        batch = client.beta.messages.batches.retrieve(job["batch_id"])
+        if batch.processing_status != "ended":
+            return jsonify({"status": "processing"})
+        
+        # Exactly one poll, in any gunicorn worker, gets to finish the job (and download the results)
+        if not claim_job(job_id):
+            return jsonify({"status": "processing"})
+        try:
+            job = load_job(job_id)  # a poll that claimed before us may have finished it already
+            if job.get("download_url") or job.get("error"):
+                return jsonify(job_response(job))
+            result = next((r for r in client.beta.messages.batches.results(job["batch_id"])
+                           if r.custom_id == job_id), None)
+            if not result or result.result.type != "succeeded":
+                job["error"] = f"Batch request {result.result.type if result else 'missing'}"
+                save_job(job_id, job)
+                return jsonify(job_response(job))
+            
+            # From here a failure is the job's, not the poll's: record it so later polls don't redo it
+            try:
+                message = result.result.message
+                num_slides = job.get("num_slides", 12)
+                if message.stop_reason == "max_tokens":
+                    params = slide_content_params(job["client_name"], job["company_name"], job["pres_type"],
+                                                  job["tone"], job["key_points"], num_slides)
+                    slides = continue_truncated_slides(params, message, num_slides)
+                else:
+                    slides = slides_from_message(message)
+                output_path = create_pptx(slides, job["colors"], job["client_name"], job["company_name"],
+                                          job["pres_type"], job["tone"], job["logo_path"], job["font_style"])
+                job["download_url"] = f"/api/download/{Path(output_path).name}"
+                job["filename"] = f"{job['client_name'].replace(' ', '_')}_{job['pres_type'].replace(' ', '_')}.pptx"
+                job["slides_count"] = len(slides)
+            except Exception as e:
+                job["error"] = str(e) or "Failed to build the presentation. Please try again."
+            save_job(job_id, job)
+        finally:
+            release_job(job_id)
+        if job.get("error"):
+            return jsonify(job_response(job))
+        
+        # Charged to whoever submitted the batch, never to whoever happens to poll it
+        if job.get("uid"):
+            log_usage(title=f"{job['client_name']} — {job['pres_type']}", slides=len(slides), uid=job["uid"])
+            save_proposal(job["client_name"], job["company_name"], job["pres_type"], job["key_points"],
+                          len(slides), job["download_url"], uid=job["uid"])
+        return jsonify(job_response(job))
     except json.JSONDecodeError:
         return jsonify({"error": "Failed to generate slide content. Please try again."}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def job_response(job):
+    if job.get("error"):
+        return {"status": "failed", "error": job["error"]}
+    return {"status": "done", "success": True, "download_url": job["download_url"],
+            "filename": job["filename"], "slides_count": job["slides_count"], "colors": job["colors"]}
+
 @app.route('/api/polish', methods=['POST'])
 def polish():
     try:
@@ -763,7 +1398,7 @@ def polish():
             return jsonify({"error": "Only .pptx files are supported"}), 400
 
         # Save uploaded file
-        upload_id = str(uuid.uuid4())[:8]
+        upload_id = secrets.token_hex(4)
         upload_path = UPLOAD_DIR / f"upload_{upload_id}.pptx"
         pptx_file.save(str(upload_path))
 
@@ -785,12 +1420,10 @@ def polish():
         if 'logo' in request.files and request.files['logo'].filename:
             logo_file = request.files['logo']
             logo_ext = Path(logo_file.filename).suffix.lower()
-            if logo_ext in ('.png', '.jpg', '.jpeg', '.webp', '.svg'):
-                logo_id = str(uuid.uuid4())[:8]
-                logo_path = UPLOAD_DIR / f"logo_{logo_id}{logo_ext}"
-                logo_file.save(str(logo_path))
+            if logo_ext in LOGO_EXTENSIONS:
+                logo_path, logo_data = save_logo(logo_file)
                 if logo_ext != '.svg':
-                    colors = extract_colors_from_logo(str(logo_path))
+                    colors = extract_colors_from_logo(logo_data)
 
         # Get client/company from first slide title or form
         client_name = request.form.get('client_name', '').strip()
@@ -854,13 +1487,11 @@ def brand_settings():
     if 'logo' in request.files and request.files['logo'].filename:
         logo_file = request.files['logo']
         logo_ext = Path(logo_file.filename).suffix.lower()
-        if logo_ext in ('.png', '.jpg', '.jpeg', '.webp', '.svg'):
-            logo_id = str(uuid.uuid4())[:8]
-            logo_path = UPLOAD_DIR / f"brand_{uid}_{logo_id}{logo_ext}"
-            logo_file.save(str(logo_path))
+        if logo_ext in LOGO_EXTENSIONS:
+            logo_path, logo_data = save_logo(logo_file)
             colors = default_colors()
             if logo_ext != '.svg':
-                colors = extract_colors_from_logo(str(logo_path))
+                colors = extract_colors_from_logo(logo_data)
             # Apply manual overrides if provided
             if manual_primary and len(manual_primary) == 6:
                 colors['primary'] = manual_primary
@@ -934,7 +1565,7 @@ def version():
             return jsonify({"error": "Please upload a PPTX file"}), 400
 
         pptx_file = request.files['pptx_file']
-        upload_id = str(uuid.uuid4())[:8]
+        upload_id = secrets.token_hex(4)
         upload_path = UPLOAD_DIR / f"upload_{upload_id}.pptx"
         pptx_file.save(str(upload_path))
 
@@ -953,18 +1584,19 @@ def version():
         if 'logo' in request.files and request.files['logo'].filename:
             logo_file = request.files['logo']
             logo_ext = Path(logo_file.filename).suffix.lower()
-            if logo_ext in ('.png', '.jpg', '.jpeg', '.webp', '.svg'):
-                lid = str(uuid.uuid4())[:8]
-                logo_path = UPLOAD_DIR / f"logo_{lid}{logo_ext}"
-                logo_file.save(str(logo_path))
+            if logo_ext in LOGO_EXTENSIONS:
+                logo_path, logo_data = save_logo(logo_file)
                 if logo_ext != '.svg':
-                    colors = extract_colors_from_logo(str(logo_path))
+                    colors = extract_colors_from_logo(logo_data)
         colors, logo_path, font_style = apply_brand(colors, logo_path, font_style)
 
+        # One Claude call per audience; they're independent, so run them side by side
+        futures = [io_pool.submit(generate_audience_version, original_slides, audience, num_slides=None)
+                   for audience in audiences]
         results = []
-        for audience in audiences:
+        for audience, future in zip(audiences, futures):
             try:
-                slides = generate_audience_version(original_slides, audience, num_slides=None)
+                slides = future.result()
                 output_path = create_pptx(slides, colors, client_name, company_name,
                                          f'{audience.title()} Version', 'Corporate',
                                          logo_path, font_style)
@@ -992,7 +1624,7 @@ def style_transfer():
         if 'reference_file' not in request.files or not request.files['reference_file'].filename:
             return jsonify({"error": "Please upload a reference/style PPTX"}), 400
 
-        uid = str(uuid.uuid4())[:8]
+        uid = secrets.token_hex(4)
 
         content_file = request.files['content_file']
         content_path = UPLOAD_DIR / f"content_{uid}.pptx"
@@ -1021,12 +1653,10 @@ def style_transfer():
         if 'logo' in request.files and request.files['logo'].filename:
             logo_file = request.files['logo']
             logo_ext = Path(logo_file.filename).suffix.lower()
-            if logo_ext in ('.png', '.jpg', '.jpeg', '.webp', '.svg'):
-                lid = str(uuid.uuid4())[:8]
-                logo_path = UPLOAD_DIR / f"logo_{lid}{logo_ext}"
-                logo_file.save(str(logo_path))
+            if logo_ext in LOGO_EXTENSIONS:
+                logo_path, logo_data = save_logo(logo_file)
                 if logo_ext != '.svg':
-                    colors = extract_colors_from_logo(str(logo_path))
+                    colors = extract_colors_from_logo(logo_data)
         colors, logo_path, font_style = apply_brand(colors, logo_path, font_style)
 
         output_path = create_pptx(styled_slides, colors, client_name, company_name,
@@ -1060,7 +1690,7 @@ def merge_decks():
         file_names = []
         for f in files:
             if not f.filename.lower().endswith('.pptx'): continue
-            uid = str(uuid.uuid4())[:8]
+            uid = secrets.token_hex(4)
             fpath = UPLOAD_DIR / f"merge_{uid}.pptx"
             f.save(str(fpath))
             slides = extract_slides_from_pptx(str(fpath))
@@ -1086,12 +1716,10 @@ def merge_decks():
         if 'logo' in request.files and request.files['logo'].filename:
             logo_file = request.files['logo']
             logo_ext = Path(logo_file.filename).suffix.lower()
-            if logo_ext in ('.png', '.jpg', '.jpeg', '.webp', '.svg'):
-                lid = str(uuid.uuid4())[:8]
-                logo_path = UPLOAD_DIR / f"logo_{lid}{logo_ext}"
-                logo_file.save(str(logo_path))
+            if logo_ext in LOGO_EXTENSIONS:
+                logo_path, logo_data = save_logo(logo_file)
                 if logo_ext != '.svg':
-                    colors = extract_colors_from_logo(str(logo_path))
+                    colors = extract_colors_from_logo(logo_data)
         colors, logo_path, font_style = apply_brand(colors, logo_path, font_style)
 
         output_path = create_pptx(merged_slides, colors, client_name, company_name,
@@ -1119,7 +1747,7 @@ def split_deck():
             return jsonify({"error": "Please upload a PPTX file"}), 400
 
         pptx_file = request.files['pptx_file']
-        uid = str(uuid.uuid4())[:8]
+        uid = secrets.token_hex(4)
         upload_path = UPLOAD_DIR / f"split_{uid}.pptx"
         pptx_file.save(str(upload_path))
 
@@ -1136,20 +1764,25 @@ def split_deck():
         if 'logo' in request.files and request.files['logo'].filename:
             logo_file = request.files['logo']
             logo_ext = Path(logo_file.filename).suffix.lower()
-            if logo_ext in ('.png', '.jpg', '.jpeg', '.webp', '.svg'):
-                lid = str(uuid.uuid4())[:8]
-                logo_path = UPLOAD_DIR / f"logo_{lid}{logo_ext}"
-                logo_file.save(str(logo_path))
+            if logo_ext in LOGO_EXTENSIONS:
+                logo_path, logo_data = save_logo(logo_file)
                 if logo_ext != '.svg':
-                    colors = extract_colors_from_logo(str(logo_path))
+                    colors = extract_colors_from_logo(logo_data)
         colors, logo_path, font_style = apply_brand(colors, logo_path, font_style)
 
         # Generate executive summary (short) + appendix (detailed)
         results = []
 
-        # Part 1: Executive Summary
         summary_prompt = "Extract only the most critical content. Create a tight 6-slide executive summary: title, key takeaway, 2-3 main points with stats/visuals, recommendation, closing. Be ruthlessly concise."
-        summary_slides = polish_slide_content(original_slides, summary_prompt, num_slides=6, tone="Corporate")
+        detail_prompt = "Expand all supporting details into a comprehensive appendix deck. Include all data, processes, timelines, team info, and supporting evidence. This is the deep-dive version."
+        # Both Claude calls work from the original slides, so run them side by side
+        summary_future = io_pool.submit(polish_slide_content, original_slides, summary_prompt,
+                                        num_slides=6, tone="Corporate")
+        detail_future = io_pool.submit(polish_slide_content, original_slides, detail_prompt,
+                                       num_slides=max(len(original_slides), 12), tone="Corporate")
+
+        # Part 1: Executive Summary
+        summary_slides = summary_future.result()
         summary_path = create_pptx(summary_slides, colors, client_name, company_name,
                                    'Executive Summary', 'Corporate', logo_path, font_style)
         results.append({
@@ -1160,9 +1793,7 @@ def split_deck():
         })
 
         # Part 2: Full Detail / Appendix
-        detail_prompt = "Expand all supporting details into a comprehensive appendix deck. Include all data, processes, timelines, team info, and supporting evidence. This is the deep-dive version."
-        detail_slides = polish_slide_content(original_slides, detail_prompt,
-                                            num_slides=max(len(original_slides), 12), tone="Corporate")
+        detail_slides = detail_future.result()
         detail_path = create_pptx(detail_slides, colors, client_name, company_name,
                                   'Full Detail', 'Corporate', logo_path, font_style)
         results.append({
@@ -1181,6 +1812,19 @@ def split_deck():
 @app.route('/api/download/<filename>')
 def download(filename):
     filepath = OUTPUT_DIR / filename
+    name = request.args.get('name', filename)
+    # Behind a proxy, hand the file to it instead of streaming through Python
+    if XACCEL_PREFIX and filepath.is_file():
+        resp = Response(mimetype=PPTX_MIMETYPE)
+        resp.headers['X-Accel-Redirect'] = XACCEL_PREFIX + filename
+        resp.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(name)}"
+        return resp
+    if app.config['USE_X_SENDFILE'] and filepath.is_file():
+        return send_file(str(filepath), as_attachment=True, mimetype=PPTX_MIMETYPE, download_name=name)
+    with pptx_cache_lock:
+        data = pptx_cache.get(filename)
+    if data is not None:
+        return send_file(BytesIO(data), as_attachment=True, mimetype=PPTX_MIMETYPE, download_name=name)
     if not filepath.exists():
         return jsonify({"error": "File not found"}), 404
     return send_file(str(filepath), as_attachment=True,
@@ -1188,19 +1832,37 @@ def download(filename):
 
 @app.route('/api/preview-colors', methods=['POST'])
 def preview_colors():
-    """Preview colors from uploaded logo"""
+    """Preview colors from uploaded logo; keeps the file so /api/generate can reuse it by logo_id"""
     if 'logo' not in request.files:
-        return jsonify(default_colors())
+        return jsonify({"colors": default_colors(), "logo_id": None})
     logo_file = request.files['logo']
-    if not logo_file.filename:
-        return jsonify(default_colors())
+    logo_ext = Path(logo_file.filename or '').suffix.lower()
+    if logo_ext not in LOGO_EXTENSIONS:
+        return jsonify({"colors": default_colors(), "logo_id": None})
     
-    temp_path = UPLOAD_DIR / f"temp_{uuid.uuid4().hex[:8]}{Path(logo_file.filename).suffix}"
-    logo_file.save(str(temp_path))
-    colors = extract_colors_from_logo(str(temp_path))
-    try: os.unlink(str(temp_path))
-    except: pass
-    return jsonify(colors)
+    logo_path, data = save_logo(logo_file)
+    # Colors come from the bytes already in memory, not a re-read of the saved file
+    colors = default_colors() if logo_ext == '.svg' else extract_colors_from_logo(data)
+    return jsonify({"colors": colors, "logo_id": logo_path.stem[len("logo_"):]})
+
+def save_logo(logo_file):
+    """Store an uploaded logo under its content hash, writing only if new; returns (path, bytes)"""
+    data = logo_file.read()
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    logo_path = UPLOAD_DIR / f"logo_{digest}{Path(logo_file.filename).suffix.lower()}"
+    if not logo_path.exists():
+        logo_path.write_bytes(data)
+    return logo_path, data
+
+def find_saved_logo(logo_id):
+    """Path of a logo saved by save_logo (the logo_id from /api/preview-colors), or None"""
+    if len(logo_id) != 32 or any(c not in '0123456789abcdef' for c in logo_id):
+        return None
+    for ext in LOGO_EXTENSIONS:
+        path = UPLOAD_DIR / f"logo_{logo_id}{ext}"
+        if path.exists():
+            return path
+    return None
 
 # ── Main Page ─────────────────────────────────────────────────
 LANDING_HTML = """<!DOCTYPE html>
@@ -1208,6 +1870,7 @@ LANDING_HTML = """<!DOCTYPE html>
 <meta charset="UTF-8"><meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>ProposalSnap — AI Presentation Maker</title>
 <link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="prefetch" href="/demo-gallery" as="document">
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=JetBrains+Mono:wght@400;500&display=swap" rel="stylesheet">
 <style>
 :root{--bg:#0B0F1A;--surface:#131829;--border:rgba(255,255,255,0.08);--text:#F0F0F5;
@@ -1430,6 +2093,7 @@ border-radius:20px;cursor:pointer;border:1px solid transparent;transition:all 0.
 <p style="color:var(--text2);font-size:13px;margin-bottom:12px">Upload your logo — we'll extract colors. You can also adjust colors manually.</p>
 <div class="file-upload" id="logoDropzone" onclick="document.getElementById('logoInput').click()">
 <input type="file" id="logoInput" accept=".png,.jpg,.jpeg,.webp,.svg" onchange="handleLogo(this)">
+<input type="hidden" id="logoId">
 <div id="logoText">📎 Click to upload logo (PNG, JPG, SVG)</div>
 </div>
 <div class="color-preview" id="colorPreview" style="display:none;">
@@ -1702,12 +2366,15 @@ async function handleLogo(input) {
   document.getElementById('logoText').innerHTML = '<div style="display:flex;align-items:center;gap:10px;justify-content:center"><img id="logoThumb" src="'+URL.createObjectURL(file)+'" style="max-height:40px;max-width:80px;border-radius:6px;object-fit:contain"><span>✓ '+file.name+'</span></div>';
   document.getElementById('logoDropzone').classList.add('has-file');
   
-  // Preview colors
+  // Preview colors (the server keeps the file; generate() sends back logo_id)
+  document.getElementById('logoId').value = '';
   const formData = new FormData();
   formData.append('logo', file);
   try {
     const res = await fetch('/api/preview-colors', { method: 'POST', body: formData });
-    const colors = await res.json();
+    const data = await res.json();
+    const colors = data.colors;
+    document.getElementById('logoId').value = data.logo_id || '';
     document.getElementById('cprimary').style.background = '#' + colors.primary;
     document.getElementById('csecondary').style.background = '#' + colors.secondary;
     document.getElementById('caccent').style.background = '#' + colors.accent;
@@ -1791,7 +2458,10 @@ async function generate() {
   formData.append('num_slides', numSlides);
   
   const logoInput = document.getElementById('logoInput');
-  if (logoInput.files.length) {
+  const logoId = document.getElementById('logoId').value;
+  if (logoId) {
+    formData.append('logo_id', logoId);
+  } else if (logoInput.files.length) {
     formData.append('logo', logoInput.files[0]);
   }
   const mp = document.getElementById('manualPrimary');
@@ -1801,7 +2471,16 @@ async function generate() {
   
   try {
     const res = await fetch('/api/generate', { method: 'POST', body: formData });
-    const data = await res.json();
+    let data = await res.json();
+    
+    // Generation runs server-side as a job; poll until it finishes
+    if (data.status_url) {
+      const statusUrl = data.status_url;
+      do {
+        await new Promise(r => setTimeout(r, 1000));
+        data = await (await fetch(statusUrl)).json();
+      } while (data.status === 'processing');
+    }
     
     if (data.success) {
       const downloadUrl = data.download_url + '?name=' + encodeURIComponent(data.filename);
@@ -2070,6 +2749,65 @@ async function doSplit() {
 </script>
 </body></html>"""
 
+# Pages are compiled once at import; rendered bytes (plain + gzip) are reused with an ETag
+STYLE_RE = re.compile(r"(<style>)(.*?)(</style>)", re.S)
+
+def minify_css(css):
+    """Strip comments and insignificant whitespace; rcssmin when installed, else a conservative regex pass"""
+    if cssmin:
+        return cssmin(css)
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)  # never before a colon: "a :hover" differs from "a:hover"
+    return css.replace(";}", "}").strip()
+
+# Blocks whose whitespace is content; the fallback HTML pass leaves them untouched
+RAW_BLOCK_RE = re.compile(r"(<script\b.*?</script>|<style\b.*?</style>|<pre\b.*?</pre>|<textarea\b.*?</textarea>)", re.S | re.I)
+
+def compact_html(html):
+    """Drop comments and indentation; minify-html when installed, else a conservative pass outside raw blocks"""
+    if minify_html:
+        return minify_html.minify(html, minify_css=True, minify_js=True, keep_closing_tags=True)
+    parts = RAW_BLOCK_RE.split(html)
+    for i in range(0, len(parts), 2):
+        text = re.sub(r"<!--(?!\[).*?-->", "", parts[i], flags=re.S)
+        parts[i] = re.sub(r"\n\s+", "\n", text)  # a newline alone still separates inline words
+    return "".join(parts)
+
+def prerender(html):
+    """(body, gzip, brotli or None, etag) for a fully rendered page, minified once here"""
+    body = compact_html(STYLE_RE.sub(lambda m: m[1] + minify_css(m[2]) + m[3], html)).encode()
+    br = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT) if brotli else None
+    # mtime=0 keeps the gzip bytes identical across workers and restarts, as the shared "-gz" ETag promises
+    return body, gzip.compress(body, compresslevel=9, mtime=0), br, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+MAIN_TEMPLATE = app.jinja_env.from_string(MAIN_HTML)
+LANDING_PAGE = prerender(app.jinja_env.from_string(LANDING_HTML).render())
+
+@lru_cache(maxsize=16)
+def render_main(is_admin, is_demo, hub_url):
+    """Prerendered MAIN_HTML; only a handful of flag combinations ever exist"""
+    return prerender(MAIN_TEMPLATE.render(is_admin=is_admin, hub_url=hub_url, is_demo=is_demo))
+
+def cached_page(page, cache_control, mimetype='text/html'):
+    """Response for a prerendered page: brotli or gzip when accepted, 304 on If-None-Match"""
+    body, gz, br, etag = page
+    if br and request.accept_encodings['br']:
+        resp = Response(br, mimetype=mimetype)
+        resp.headers['Content-Encoding'] = 'br'
+        etag += '-br'
+    elif request.accept_encodings['gzip']:
+        resp = Response(gz, mimetype=mimetype)
+        resp.headers['Content-Encoding'] = 'gzip'
+        etag += '-gz'  # distinct representation, distinct strong ETag
+    else:
+        resp = Response(body, mimetype=mimetype)
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = cache_control
+    resp.vary.add('Accept-Encoding')
+    return resp.make_conditional(request)
+
 @app.route('/')
 def index():
     if 'user_id' in session:
@@ -2105,7 +2843,7 @@ def demo_login():
 
 @app.route('/welcome')
 def welcome():
-    return render_template_string(LANDING_HTML)
+    return cached_page(LANDING_PAGE, 'public, max-age=3600')
 
 @app.route('/login', methods=['GET'])
 def login():
@@ -2154,7 +2892,14 @@ def send_otp():
     cur.execute("INSERT INTO otp_codes (email, code, purpose, expires_at) VALUES (%s,%s,%s,%s)",
                 (email, code, purpose, expires))
     conn.close()
-    if send_otp_email(email, code, purpose):
+    # Resend is usually quick; if it's slow, answer now and let the send finish in the background
+    sending = notify_pool.submit(send_otp_email, email, code, purpose)
+    try:
+        sent = sending.result(timeout=OTP_SEND_WAIT)
+    except TimeoutError:
+        # Still queued: cancel it and show the fallback code. Mid-request to Resend: assume it lands
+        sent = not sending.cancel() and (sending.running() or sending.result())
+    if sent:
         return jsonify({"success": True})
     return jsonify({"success": True, "fallback_code": code, "email_failed": True})
 
@@ -2241,7 +2986,7 @@ def api_register():
         session['user_id'] = user_id
         session['company_name'] = company
         session.permanent = True
-        register_with_hub(company, email, currency)
+        notify_pool.submit(register_with_hub, company, email, currency)  # fire-and-forget; the hub can be slow
         return jsonify({"success": True, "redirect": "/create"})
     except psycopg2.errors.UniqueViolation:
         conn.close()
@@ -2265,7 +3010,8 @@ def create():
     cur2.execute('SELECT email FROM users WHERE id=%s', (session.get('user_id'),))
     u2 = cur2.fetchone(); conn2.close()
     is_demo = (u2 and u2.get('email') == 'demo@varnam.app')
-    return render_template_string(MAIN_HTML, is_admin=is_admin, hub_url=hub_url, is_demo=is_demo)
+    # Per-user flags are baked in, so only the browser may cache it (and must revalidate)
+    return cached_page(render_main(bool(is_admin), bool(is_demo), hub_url), 'private, no-cache')
 
 @app.route('/admin')
 @login_required
@@ -2411,16 +3157,6 @@ body{font-family:'Inter',sans-serif;background:var(--bg);color:var(--text);min-h
 </div>
 </body></html>"""
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    print(f"\n{'='*50}")
-    print(f"  🎯 ProposalSnap is running!")
-    print(f"{'='*50}")
-    print(f"  Open: http://localhost:{port}")
-    print(f"{'='*50}\n")
-    app.run(host='0.0.0.0', port=port, debug=True)
-
-
 @app.route('/auto-login')
 def auto_login():
     """SSO entry point — called by FinanceSnap with a signed token."""
@@ -2444,8 +3180,8 @@ def auto_login():
         else:
             user_id = user['id']
         conn.close()
-    except Exception as e:
-        import traceback; print(f"SSO auto-login error for {email}: {e}\n{traceback.format_exc()}")
+    except Exception:
+        app.logger.exception(f"SSO auto-login error for {email}")
         return redirect('/login')
     session.clear()
     session['user_id'] = user_id
@@ -2454,17 +3190,19 @@ def auto_login():
 
 @app.route('/demo-gallery')
 def demo():
-    hub_url = os.environ.get('HUB_URL', 'https://snapsuite.up.railway.app')
-    return render_template_string(DEMO_GALLERY_HTML, hub_url=hub_url)
-
-DEMO_GALLERY_HTML = r'''<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">
-<title>ProposalSnap — Demo Gallery</title>
-<link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700;800;900&family=Playfair+Display:wght@600;700;800;900&family=JetBrains+Mono:wght@400;500;600&display=swap" rel="stylesheet">
-<style>
-:root{--bg:#06080F;--surface:#0D1117;--card:#131920;--border:#1C2433;--border2:#2A3548;--text:#E2E8F0;--text2:#6B7A90;
+    return cached_page(GALLERY_PAGE, 'public, max-age=3600')
+
+@app.route('/static/gallery.<version>.css')
+def gallery_css(version):
+    # The filename carries the content hash, so the body behind a URL never changes;
+    # a stale hash 404s rather than caching today's CSS under yesterday's name forever
+    if version != GALLERY_CSS_HASH:
+        return "Not found", 404
+    return cached_page(GALLERY_CSS, 'public, max-age=31536000, immutable', mimetype='text/css')
+
+# Above-the-fold rules (page chrome, proposal headers, slide boxes, mobile layout) are inlined;
+# slide contents and themes arrive as a cacheable stylesheet (GALLERY_DEFERRED_CSS) without blocking first paint
+GALLERY_CRITICAL_CSS = r''':root{--bg:#06080F;--surface:#0D1117;--card:#131920;--border:#1C2433;--border2:#2A3548;--text:#E2E8F0;--text2:#6B7A90;
 --blue:#3B82F6;--green:#4ADE80;--red:#F87171;--orange:#F59E0B;--purple:#A78BFA;--teal:#2DD4BF;--pink:#F472B6;--cyan:#22D3EE;--indigo:#818CF8}
 *{margin:0;padding:0;box-sizing:border-box}
 body{font-family:'DM Sans',sans-serif;background:var(--bg);color:var(--text);min-height:100vh}
@@ -2484,14 +3222,17 @@ body::before{content:'';position:fixed;inset:0;background:radial-gradient(ellips
 .hero-section h2{font-size:36px;font-weight:900;color:#fff;letter-spacing:-1.5px;margin-bottom:8px}
 .hero-section .sub{font-size:16px;color:var(--text2);line-height:1.6;max-width:600px}
 .hero-section .badge{display:inline-flex;align-items:center;gap:6px;padding:6px 14px;background:rgba(59,130,246,.08);border:1px solid rgba(59,130,246,.15);border-radius:50px;font-size:12px;font-weight:700;color:var(--blue);margin-bottom:16px}
-.hero-section .badge .dot{width:6px;height:6px;border-radius:50%;background:var(--green);animation:pulse 2s infinite}
+.hero-section .badge .dot{width:6px;height:6px;border-radius:50%;background:var(--green);animation:pulse 2s infinite;will-change:opacity}
 @keyframes pulse{0%,100%{opacity:1}50%{opacity:.3}}
+@media(prefers-reduced-motion:reduce){*{animation:none!important;transition:none!important}}
 
 /* Main */
 .main{max-width:1200px;margin:0 auto;padding:32px;position:relative;z-index:1}
 
 /* Proposal section */
 .proposal{margin-bottom:48px;position:relative}
+/* Later proposals start below the fold; ~460px is one header + slide row + footer */
+.proposal+.proposal{content-visibility:auto;contain-intrinsic-size:auto 460px}
 .proposal-label{font-family:'JetBrains Mono',monospace;font-size:11px;text-transform:uppercase;letter-spacing:2px;font-weight:600;margin-bottom:12px}
 
 /* Proposal header card */
@@ -2520,132 +3261,145 @@ body::before{content:'';position:fixed;inset:0;background:radial-gradient(ellips
 /* Individual slide */
 .slide{min-width:300px;max-width:300px;aspect-ratio:16/9;border-radius:12px;flex-shrink:0;scroll-snap-align:start;position:relative;overflow:hidden;cursor:default;transition:transform .3s,box-shadow .3s;border:1px solid rgba(255,255,255,.06)}
 .slide:hover{transform:translateY(-4px) scale(1.02);box-shadow:0 16px 48px rgba(0,0,0,.5)}
+/* Slides past the first two start off-screen in the scroller: skip their layout/paint until scrolled near */
+.slide:nth-child(n+3){content-visibility:auto;contain-intrinsic-size:auto 300px auto 169px}
 .slide-inner{position:absolute;inset:0;padding:22px 24px;display:flex;flex-direction:column;z-index:2}
 .slide-num{position:absolute;top:10px;right:12px;font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:600;opacity:.35;z-index:3}
 
-/* Slide decorative elements */
-.slide-deco{position:absolute;inset:0;z-index:1;overflow:hidden;pointer-events:none}
-.slide-deco .circle{position:absolute;border-radius:50%;opacity:.08}
-.slide-deco .line{position:absolute;height:1px;opacity:.1}
-.slide-deco .corner{position:absolute;width:40px;height:40px;opacity:.12}
-.slide-deco .corner::before,.slide-deco .corner::after{content:'';position:absolute;background:currentColor}
-.slide-deco .corner.tl{top:12px;left:12px}.slide-deco .corner.tl::before{top:0;left:0;width:16px;height:1.5px}.slide-deco .corner.tl::after{top:0;left:0;width:1.5px;height:16px}
-.slide-deco .corner.br{bottom:12px;right:12px}.slide-deco .corner.br::before{bottom:0;right:0;width:16px;height:1.5px}.slide-deco .corner.br::after{bottom:0;right:0;width:1.5px;height:16px}
-.slide-deco .dots{position:absolute;display:grid;grid-template-columns:repeat(5,4px);gap:8px;opacity:.08}
-.slide-deco .dots span{width:4px;height:4px;border-radius:50%;background:currentColor}
-
 /* Slide title styles */
-.slide h4{font-family:'Playfair Display',serif;font-weight:800;line-height:1.2;margin-bottom:8px;position:relative}
-.slide .slide-label{font-family:'JetBrains Mono',monospace;font-size:9px;text-transform:uppercase;letter-spacing:2px;opacity:.5;margin-bottom:auto}
-.slide p{font-size:11px;line-height:1.65;opacity:.8}
-.slide .tag{font-family:'JetBrains Mono',monospace;font-size:8px;padding:3px 8px;border-radius:4px;letter-spacing:1.5px;text-transform:uppercase;margin-top:auto;display:inline-block;width:fit-content}
-.slide .divider{width:32px;height:2px;margin:8px 0;border-radius:1px}
-.slide .icon-row{display:flex;gap:6px;margin-top:8px}
-.slide .icon-row span{width:24px;height:24px;border-radius:6px;display:flex;align-items:center;justify-content:center;font-size:11px;background:rgba(255,255,255,.1)}
+.slide h4{font-family:'Playfair Display',serif;font-weight:800;line-height:1.2;margin-bottom:8px;position:relative;color:var(--ac);font-size:16px}
+.slide .slide-label{font-family:'JetBrains Mono',monospace;font-size:9px;text-transform:uppercase;letter-spacing:2px;opacity:.5;margin-bottom:auto;color:var(--label)}
+.slide p{font-size:11px;line-height:1.65;opacity:.8;color:var(--body)}
+.slide .tag{font-family:'JetBrains Mono',monospace;font-size:8px;padding:3px 8px;border-radius:4px;letter-spacing:1.5px;text-transform:uppercase;margin-top:auto;display:inline-block;width:fit-content;background:var(--tag-bg);color:var(--ac);border:1px solid var(--tag-line)}
+.slide .divider{width:32px;height:2px;margin:8px 0;border-radius:1px;background:var(--divider,var(--ac))}
+/* Themes: each family sets its colors once; the .slide text rules above read them.
+   --ac accent, --body paragraph text, --tag-bg/--tag-line tag fill and border,
+   optional --label (slide label), --divider and --deco (circle) overrides */
 
 /* Theme: Corporate Navy (Brand Identity) */
+.theme-corp,.theme-corp-alt,.theme-corp-accent,.theme-corp-dark{--ac:#e94560;--body:#b8c5d6;--tag-bg:rgba(233,69,96,.15);--tag-line:rgba(233,69,96,.2)}
 .theme-corp{background:linear-gradient(145deg,#0a1628,#162240)}
 .theme-corp-alt{background:linear-gradient(145deg,#162240,#0f3460)}
 .theme-corp-accent{background:linear-gradient(145deg,#0f3460,#1a1a40)}
 .theme-corp-dark{background:linear-gradient(145deg,#0a0f1f,#0a1628)}
-.theme-corp h4{color:#e94560;font-size:16px}
-.theme-corp p,.theme-corp-alt p,.theme-corp-accent p,.theme-corp-dark p{color:#b8c5d6}
-.theme-corp .tag{background:rgba(233,69,96,.15);color:#e94560;border:1px solid rgba(233,69,96,.2)}
-.theme-corp .divider,.theme-corp-alt .divider,.theme-corp-accent .divider{background:#e94560}
-.theme-corp-alt h4,.theme-corp-accent h4,.theme-corp-dark h4{color:#e94560;font-size:16px}
-.theme-corp .slide-deco .circle,.theme-corp-alt .slide-deco .circle{background:#e94560}
-.theme-corp .slide-deco .line,.theme-corp-alt .slide-deco .line{background:#e94560}
-.theme-corp .slide-deco .corner,.theme-corp-alt .slide-deco .corner,.theme-corp-accent .slide-deco .corner{color:#e94560}
-.theme-corp .slide-deco .dots span,.theme-corp-alt .slide-deco .dots span{background:#e94560}
 
 /* Theme: Wedding (Burgundy/Gold) */
+.theme-wed,.theme-wed-alt,.theme-wed-accent{--ac:#f5c6a5;--body:#d4a9b8;--tag-bg:rgba(245,198,165,.1);--tag-line:rgba(245,198,165,.2);--label:#f5c6a5;--divider:linear-gradient(90deg,#f5c6a5,#c62a88);--deco:#c62a88}
 .theme-wed{background:linear-gradient(145deg,#1f0a1a,#3d1132)}
 .theme-wed-alt{background:linear-gradient(145deg,#3d1132,#5c1a4a)}
 .theme-wed-accent{background:linear-gradient(145deg,#2a0e24,#1f0a1a)}
-.theme-wed h4,.theme-wed-alt h4,.theme-wed-accent h4{color:#f5c6a5;font-size:16px}
-.theme-wed p,.theme-wed-alt p,.theme-wed-accent p{color:#d4a9b8}
-.theme-wed .tag{background:rgba(245,198,165,.1);color:#f5c6a5;border:1px solid rgba(245,198,165,.2)}
-.theme-wed .divider,.theme-wed-alt .divider{background:linear-gradient(90deg,#f5c6a5,#c62a88)}
-.theme-wed .slide-deco .circle,.theme-wed-alt .slide-deco .circle{background:#c62a88}
-.theme-wed .slide-deco .corner,.theme-wed-alt .slide-deco .corner,.theme-wed-accent .slide-deco .corner{color:#f5c6a5}
-.theme-wed .slide-deco .dots span,.theme-wed-alt .slide-deco .dots span{background:#f5c6a5}
 
 /* Theme: Workshop (Teal/Mint) */
+.theme-wk,.theme-wk-alt,.theme-wk-accent{--ac:#64ffda;--body:#8892b0;--tag-bg:rgba(100,255,218,.08);--tag-line:rgba(100,255,218,.15);--label:#64ffda}
 .theme-wk{background:linear-gradient(145deg,#06111f,#0a192f)}
 .theme-wk-alt{background:linear-gradient(145deg,#0a192f,#112240)}
 .theme-wk-accent{background:linear-gradient(145deg,#112240,#0a192f)}
-.theme-wk h4,.theme-wk-alt h4,.theme-wk-accent h4{color:#64ffda;font-size:16px}
-.theme-wk p,.theme-wk-alt p,.theme-wk-accent p{color:#8892b0}
-.theme-wk .tag{background:rgba(100,255,218,.08);color:#64ffda;border:1px solid rgba(100,255,218,.15)}
-.theme-wk .divider,.theme-wk-alt .divider{background:#64ffda}
-.theme-wk .slide-deco .circle,.theme-wk-alt .slide-deco .circle{background:#64ffda}
-.theme-wk .slide-deco .corner,.theme-wk-alt .slide-deco .corner,.theme-wk-accent .slide-deco .corner{color:#64ffda}
-.theme-wk .slide-deco .dots span,.theme-wk-alt .slide-deco .dots span{background:#64ffda}
 
 /* Title slide special */
 .slide-title{justify-content:center;align-items:center;text-align:center}
-.slide-title h4{font-size:20px!important;margin-bottom:10px}
+.slide-title h4{font-size:20px!important;margin:12px 0 10px}
+.slide-title .divider{margin:8px auto}
+.slide-title p{font-size:12px}
 .slide-title .company-from{font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:1px;opacity:.5;margin-top:8px}
 
 /* End slide special */
 .slide-end{justify-content:center;align-items:center;text-align:center}
 .slide-end h4{font-size:18px!important}
+.slide-end .divider{margin:10px auto}
+.slide-end .tag{margin-top:12px}
 .slide-end .contact{font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:.5px;opacity:.6;margin-top:10px}
 
+/* Scroll hint */
+.scroll-hint{display:flex;align-items:center;gap:6px;font-size:11px;color:var(--text2);margin-bottom:8px}
+.scroll-hint .arrow{animation:nudge 2s infinite;display:inline-block;will-change:transform}
+@keyframes nudge{0%,100%{transform:translateX(0)}50%{transform:translateX(6px)}}
+
+/* Responsive */
+@media(max-width:768px){
+    body{overflow-x:hidden}
+    .topbar{padding:10px 14px;flex-wrap:wrap;gap:6px}
+    .topbar-right{flex-wrap:wrap;gap:4px}
+    .topbar-right a{font-size:12px;padding:5px 8px}
+    .hero-section,.main{padding-left:14px;padding-right:14px}
+    .proposal-head{flex-direction:column;gap:12px;text-align:left}
+    .ph-right{text-align:left}
+    .slide{min-width:220px;max-width:220px}
+}
+'''
+
+GALLERY_DEFERRED_CSS = r'''/* Slide decorative elements */
+.slide-deco{position:absolute;inset:0;z-index:1;overflow:hidden;pointer-events:none;color:var(--ac)}
+.slide-deco .circle{position:absolute;border-radius:50%;opacity:.08;background:var(--deco,currentColor)}
+.slide-deco .line{position:absolute;height:1px;opacity:.1;background:currentColor}
+.slide-deco svg{position:absolute;fill:currentColor}
+.slide-deco .corner{width:40px;height:40px;opacity:.12}
+.slide-deco .corner.tl{top:12px;left:12px}
+.slide-deco .corner.br{bottom:12px;right:12px}
+.slide-deco .dots{width:52px;height:16px;opacity:.08}
+
+/* Slide extras */
+.slide .icon-row{display:flex;gap:6px;margin-top:8px}
+.slide .icon-row span{width:24px;height:24px;border-radius:6px;display:flex;align-items:center;justify-content:center;font-size:11px;background:rgba(255,255,255,.1)}
+.slide .swatch-row{display:flex;gap:6px;margin-top:10px}
+.slide .swatch-row i{width:28px;height:28px;border-radius:6px;background:var(--c);border:2px solid rgba(255,255,255,.1)}
+
 /* Slide with metrics */
 .metric-row{display:flex;gap:12px;margin-top:10px}
 .metric{flex:1;text-align:center;padding:8px 4px;background:rgba(255,255,255,.04);border-radius:6px;border:1px solid rgba(255,255,255,.06)}
-.metric .mv{font-size:16px;font-weight:800;color:#fff}
+.metric .mv{font-size:16px;font-weight:800;color:var(--ac)}
 .metric .ml{font-size:8px;text-transform:uppercase;letter-spacing:1px;opacity:.5;margin-top:2px}
 
 /* Timeline visual */
 .timeline-row{display:flex;align-items:center;gap:0;margin-top:10px}
 .tl-step{flex:1;text-align:center;position:relative;padding-top:12px}
-.tl-step::before{content:'';position:absolute;top:4px;left:50%;width:8px;height:8px;border-radius:50%;transform:translateX(-50%)}
-.tl-step::after{content:'';position:absolute;top:7px;left:50%;width:100%;height:1.5px;opacity:.2}
+.tl-step::before{content:'';position:absolute;top:4px;left:50%;width:8px;height:8px;border-radius:50%;transform:translateX(-50%);background:var(--c,#888)}
+.tl-step::after{content:'';position:absolute;top:7px;left:50%;width:100%;height:1.5px;opacity:.2;background:var(--c,#888)}
 .tl-step:last-child::after{display:none}
 .tl-step span{font-size:8px;line-height:1.3;display:block;opacity:.6}
+.tl-step strong{color:var(--ac)}
 
 /* Bullet list in slides */
 .slide-list{list-style:none;padding:0;margin:6px 0}
-.slide-list li{font-size:10px;padding:3px 0 3px 14px;position:relative;opacity:.75;line-height:1.5}
-.slide-list li::before{content:'';position:absolute;left:0;top:8px;width:5px;height:5px;border-radius:50%}
+.slide-list li{font-size:10px;padding:3px 0 3px 14px;position:relative;opacity:.75;line-height:1.5;--c:var(--ac)}
+.slide-list li::before{content:'';position:absolute;left:0;top:8px;width:5px;height:5px;border-radius:50%;background:var(--c,#888)}
 
 /* Proposal footer */
 .proposal-foot{display:flex;justify-content:space-between;align-items:center;padding:14px 0;margin-top:4px}
 .proposal-foot .pf-tags{display:flex;gap:8px}
 .proposal-foot .pf-tag{font-family:'JetBrains Mono',monospace;font-size:10px;color:var(--text2);background:var(--card);border:1px solid var(--border);padding:5px 12px;border-radius:6px;display:flex;align-items:center;gap:5px}
+.proposal-foot .pf-tag svg{width:12px;height:12px;fill:none;stroke:currentColor;stroke-width:1}
 .proposal-foot a{font-size:13px;color:var(--blue);text-decoration:none;font-weight:700;transition:.2s}
 .proposal-foot a:hover{color:#fff}
 
-/* Scroll hint */
-.scroll-hint{display:flex;align-items:center;gap:6px;font-size:11px;color:var(--text2);margin-bottom:8px}
-.scroll-hint .arrow{animation:nudge 2s infinite;display:inline-block}
-@keyframes nudge{0%,100%{transform:translateX(0)}50%{transform:translateX(6px)}}
+'''
 
-/* Responsive */
-@media(max-width:768px){
-    body{overflow-x:hidden}
-    .topbar{padding:10px 14px;flex-wrap:wrap;gap:6px}
-    .topbar-right{flex-wrap:wrap;gap:4px}
-    .topbar-right a{font-size:12px;padding:5px 8px}
-    .app-topbar{flex-wrap:wrap;gap:6px;padding:10px 14px;margin-bottom:6px}
-    .app-logo{font-size:18px!important}
-    .app-topbar a{font-size:11px!important;padding:5px 8px!important}
-    .hero-section,.main{padding-left:14px;padding-right:14px}
-    .proposal-head{flex-direction:column;gap:12px;text-align:left}
-    .ph-right{text-align:left}
-    .slide{min-width:220px;max-width:220px}
-    .container{padding:14px;overflow-x:hidden}
-    input,select,textarea{font-size:16px!important}
-    .row,.row2,.row3{grid-template-columns:1fr!important}
-    .btn{padding:12px 20px}
-    .sections-grid{grid-template-columns:1fr!important}
-}
-</style>
+DEMO_GALLERY_HTML = r'''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">
+<title>ProposalSnap — Demo Gallery</title>
+<link rel="preconnect" href="https://fonts.googleapis.com">
+<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+<link href="https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700;800;900&family=Playfair+Display:wght@600;700;800;900&family=JetBrains+Mono:wght@400;500;600&display=swap{% if font_text %}&text={{ font_text|urlencode }}{% endif %}" rel="stylesheet">
+<style>{{ critical_css|safe }}</style>
+<link rel="preload" href="/static/gallery.{{ css_hash }}.css" as="style" onload="this.onload=null;this.rel='stylesheet'">
+<noscript><link rel="stylesheet" href="/static/gallery.{{ css_hash }}.css"></noscript>
 </head>
 <body>
 
+<!-- Slide decorations, drawn once and <use>d per slide; fill follows each theme's currentColor -->
+<svg width="0" height="0" style="position:absolute" aria-hidden="true">
+    <symbol id="deco-corner-tl"><path d="M0 0h16v1.5H1.5V16H0z"/></symbol>
+    <symbol id="deco-corner-br"><path d="M40 40H24v-1.5h14.5V24H40z"/></symbol>
+    <symbol id="deco-dots">{% for y in (2, 14, 26) %}{% for x in (2, 14, 26, 38, 50) %}<circle cx="{{ x }}" cy="{{ y }}" r="2"/>{% endfor %}{% endfor %}</symbol>
+    <symbol id="ic-page" viewBox="0 0 12 12"><path d="M3 1h4l2.5 2.5V11H3zM7 1v2.5h2.5M4.5 6h3M4.5 8h3"/></symbol>
+    <symbol id="ic-building" viewBox="0 0 12 12"><path d="M2 11V2h5v9M7 5h3v6M1 11h10M3.5 4h2M3.5 6h2M3.5 8h2"/></symbol>
+    <symbol id="ic-ring" viewBox="0 0 12 12"><circle cx="6" cy="7.5" r="3.5"/><path d="M4.5 1.5h3L6 3.5z"/></symbol>
+    <symbol id="ic-flower" viewBox="0 0 12 12"><circle cx="6" cy="6" r="1.5"/><path d="M6 4.5C4 3 4.5 1 6 1s2 2 0 3.5M7.5 6C9 4 11 4.5 11 6s-2 2-3.5 0M6 7.5C8 9 7.5 11 6 11s-2-2 0-3.5M4.5 6C3 8 1 7.5 1 6s2-2 3.5 0"/></symbol>
+    <symbol id="ic-type" viewBox="0 0 12 12"><path d="M2 3V1.5h8V3M6 1.5v9M4.5 10.5h3"/></symbol>
+    <symbol id="ic-palette" viewBox="0 0 12 12"><path d="M6 1a5 5 0 1 0 0 10c1 0 1.2-.8.8-1.5S7 8 8 8h1.5C10.5 8 11 7 11 6c0-2.8-2.2-5-5-5z"/><circle cx="3.5" cy="5.5" r=".6"/><circle cx="5.5" cy="3.5" r=".6"/><circle cx="8" cy="4" r=".6"/></symbol>
+</svg>
+
 <div class="topbar">
     <a href="/welcome" style="text-decoration:none;color:inherit"><h1>Proposal<span>Snap</span></h1></a>
     <div class="topbar-right">
@@ -2661,530 +3415,266 @@ body::before{content:'';position:fixed;inset:0;background:radial-gradient(ellips
 </div>
 
 <div class="main">
-
-<!-- ═══ PROPOSAL 1: Brand Identity ═══ -->
-<div class="proposal">
-    <div class="proposal-label" style="color:#e94560">● PROPOSAL 01</div>
-    <div class="proposal-head theme-corporate">
-        <div class="ph-left">
-            <h3>Brand Identity Package</h3>
-            <div class="ph-meta">
-                <span>Bloom Studio → Varnam Artboutique</span>
-                <span class="sep">·</span>
-                <span>Feb 10, 2026</span>
-                <span class="sep">·</span>
-                <span>12 slides</span>
-            </div>
-        </div>
-        <div class="ph-right">
-            <div class="price" style="font-size:13px;color:var(--accent2)">12 Slides</div>
-            <span class="status sent">Sent</span>
-        </div>
-    </div>
-    <div class="scroll-hint"><span>Scroll slides</span> <span class="arrow">→</span></div>
-    <div class="slides-wrapper">
-        <div class="slides-scroll">
-            <!-- Slide 1: Title -->
-            <div class="slide theme-corp">
+{% macro slide(s, num) %}
+            <div class="slide {{ s.theme }}">
                 <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="corner br" style="color:#e94560"></div>
-                    <div class="circle" style="width:200px;height:200px;right:-60px;bottom:-60px;background:#e94560"></div>
-                    <div class="line" style="width:60%;bottom:30%;left:20%;background:linear-gradient(90deg,transparent,#e94560,transparent)"></div>
+                    {%- for d in s.deco %}
+                    {% if d is string %}<svg class="{{ d }}"><use href="#deco-{{ d|replace(' ', '-') }}"/></svg>
+                    {%- elif d[0] == 'dots' %}<svg class="dots" style="{{ d[1] }}{% if d[2] %};height:{{ d[2] * 12 - 8 }}px{% endif %}"><use href="#deco-dots"/></svg>
+                    {%- else %}<div class="{{ d[0] }}" style="{{ d[1] }}"></div>{% endif %}
+                    {%- endfor %}
                 </div>
+                {%- if s.kind == 'title' %}
                 <div class="slide-inner slide-title">
-                    <span class="tag">CORPORATE PROPOSAL</span>
-                    <h4 style="margin-top:12px">Brand Identity<br>Package</h4>
-                    <div class="divider" style="margin:8px auto"></div>
-                    <p style="font-size:12px;color:#eee">Prepared for <strong>Varnam Artboutique</strong></p>
-                    <span class="company-from">BY BLOOM STUDIO</span>
-                </div>
-                <div class="slide-num">01</div>
-            </div>
-
-            <!-- Slide 2: The Challenge -->
-            <div class="slide theme-corp-alt">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="dots" style="right:16px;bottom:16px;color:#e94560"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">THE CHALLENGE</span>
-                    <h4>Why Rebrand Now?</h4>
-                    <div class="divider"></div>
-                    <p>Varnam Artboutique is expanding into international markets. Current branding doesn't reflect their premium positioning or rich cultural heritage. Competitors are investing heavily in design.</p>
-                    <div class="metric-row">
-                        <div class="metric"><div class="mv" style="color:#e94560">73%</div><div class="ml">Need Update</div></div>
-                        <div class="metric"><div class="mv" style="color:#e94560">2.4×</div><div class="ml">Brand Recall</div></div>
-                    </div>
-                </div>
-                <div class="slide-num">02</div>
-            </div>
-
-            <!-- Slide 3: Our Approach -->
-            <div class="slide theme-corp-accent">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="corner br" style="color:#e94560"></div>
-                    <div class="circle" style="width:120px;height:120px;left:-30px;top:-30px;background:#e94560"></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">OUR APPROACH</span>
-                    <h4>6-Phase Process</h4>
-                    <div class="divider"></div>
-                    <ul class="slide-list">
-                        <li style="--c:#e94560">Discovery &amp; Brand Audit</li>
-                        <li style="--c:#e94560">Concept Development</li>
-                        <li style="--c:#e94560">Visual Design System</li>
-                        <li style="--c:#e94560">Brand Guidelines</li>
-                        <li style="--c:#e94560">Collateral Design</li>
-                        <li style="--c:#e94560">Handoff &amp; Training</li>
-                    </ul>
-                </div>
-                <div class="slide-num">03</div>
-            </div>
-
-            <!-- Slide 4: Logo -->
-            <div class="slide theme-corp">
-                <div class="slide-deco">
-                    <div class="dots" style="left:16px;top:16px;color:#e94560"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div>
-                    <div class="line" style="width:40%;top:50%;right:0;background:#e94560"></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">DELIVERABLE</span>
-                    <h4>Logo Redesign</h4>
-                    <div class="divider"></div>
-                    <p>Modern mark blending Madhubani art motifs with contemporary typography. Primary, secondary, and icon variations.</p>
-                    <div class="icon-row">
-                        <span>🎨</span><span>✏️</span><span>📐</span>
-                    </div>
-                </div>
-                <div class="slide-num">04</div>
-            </div>
-
-            <!-- Slide 5: Color Palette -->
-            <div class="slide theme-corp-alt">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="circle" style="width:80px;height:80px;right:20px;top:20px;background:#c62a88;opacity:.12"></div>
-                    <div class="circle" style="width:60px;height:60px;right:60px;top:50px;background:#e94560;opacity:.1"></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">VISUAL SYSTEM</span>
-                    <h4>Color Palette</h4>
+                    <span class="tag">{{ s.tag }}</span>
+                    <h4>{{ s.title|safe }}</h4>
                     <div class="divider"></div>
-                    <p>Rich earth tones paired with vibrant accents inspired by traditional Indian textiles and natural dyes.</p>
-                    <div style="display:flex;gap:6px;margin-top:10px">
-                        <div style="width:28px;height:28px;border-radius:6px;background:#e94560;border:2px solid rgba(255,255,255,.1)"></div>
-                        <div style="width:28px;height:28px;border-radius:6px;background:#c62a88;border:2px solid rgba(255,255,255,.1)"></div>
-                        <div style="width:28px;height:28px;border-radius:6px;background:#0f3460;border:2px solid rgba(255,255,255,.1)"></div>
-                        <div style="width:28px;height:28px;border-radius:6px;background:#f5c6a5;border:2px solid rgba(255,255,255,.1)"></div>
-                        <div style="width:28px;height:28px;border-radius:6px;background:#1a1a2e;border:2px solid rgba(255,255,255,.1)"></div>
-                    </div>
-                </div>
-                <div class="slide-num">05</div>
-            </div>
-
-            <!-- Slide 6: Typography -->
-            <div class="slide theme-corp-accent">
-                <div class="slide-deco">
-                    <div class="corner br" style="color:#e94560"></div>
+                    <p style="color:{{ s.sub_color }}">{{ s.sub|safe }}</p>
+                    <span class="company-from"{% if s.from_style %} style="{{ s.from_style }}"{% endif %}>{{ s.from }}</span>
                 </div>
-                <div class="slide-inner">
-                    <span class="slide-label">VISUAL SYSTEM</span>
-                    <h4>Typography</h4>
+                {%- elif s.kind == 'end' %}
+                <div class="slide-inner slide-end">
+                    <h4>{{ s.title|safe }}</h4>
                     <div class="divider"></div>
-                    <div style="margin-top:4px">
-                        <div style="font-family:'Playfair Display',serif;font-size:18px;color:#fff;font-weight:700">Aa Heading</div>
-                        <div style="font-size:10px;opacity:.5;margin-bottom:6px">Playfair Display · Serif</div>
-                        <div style="font-family:'DM Sans',sans-serif;font-size:12px;color:#ccc">Aa Body text sample</div>
-                        <div style="font-size:10px;opacity:.5;margin-bottom:6px">DM Sans · Sans-serif</div>
-                        <div style="font-size:12px;color:#ccc">आ देवनागरी</div>
-                        <div style="font-size:10px;opacity:.5">Matching Hindi family</div>
-                    </div>
-                </div>
-                <div class="slide-num">06</div>
-            </div>
-
-            <!-- Slide 7: Collateral -->
-            <div class="slide theme-corp">
-                <div class="slide-deco">
-                    <div class="dots" style="right:16px;top:16px;color:#e94560"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div>
-                    <div class="corner tl" style="color:#e94560"></div>
+                    <span class="contact"{% if s.contact_style %} style="{{ s.contact_style }}"{% endif %}>hello@bloomstudio.in<br>+91 98765 43210</span>
+                    {%- if s.tag %}
+                    <span class="tag">{{ s.tag }}</span>
+                    {%- endif %}
                 </div>
+                {%- else %}
                 <div class="slide-inner">
-                    <span class="slide-label">DELIVERABLES</span>
-                    <h4>Collateral Design</h4>
+                    <span class="slide-label">{{ s.label }}</span>
+                    <h4>{{ s.title }}</h4>
                     <div class="divider"></div>
+                    {%- if s.text %}
+                    <p>{{ s.text }}</p>
+                    {%- endif %}
+                    {%- if s.list %}
                     <ul class="slide-list">
-                        <li style="--c:#e94560">Business cards &amp; letterhead</li>
-                        <li style="--c:#e94560">Packaging inserts &amp; labels</li>
-                        <li style="--c:#e94560">Exhibition banners (3 sizes)</li>
-                        <li style="--c:#e94560">Social media templates</li>
-                        <li style="--c:#e94560">WhatsApp catalog design</li>
+                        {%- for item in s.list %}
+                        <li>{{ item }}</li>
+                        {%- endfor %}
                     </ul>
-                </div>
-                <div class="slide-num">07</div>
-            </div>
-
-            <!-- Slide 8: Digital -->
-            <div class="slide theme-corp-alt">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="corner br" style="color:#e94560"></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">DIGITAL</span>
-                    <h4>Online Presence</h4>
-                    <div class="divider"></div>
-                    <p>Website UI kit, email templates, Instagram grid layout, Google Business profile assets, and e-commerce product page templates.</p>
-                </div>
-                <div class="slide-num">08</div>
-            </div>
-
-            <!-- Slide 9: Guidelines -->
-            <div class="slide theme-corp-accent">
-                <div class="slide-deco">
-                    <div class="circle" style="width:160px;height:160px;right:-40px;bottom:-40px;background:#e94560"></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">DELIVERABLE</span>
-                    <h4>Brand Guidelines</h4>
-                    <div class="divider"></div>
-                    <p>60-page comprehensive guide: logo usage, do's &amp; don'ts, spacing rules, color specs (CMYK, RGB, Pantone), voice &amp; tone.</p>
+                    {%- endif %}
+                    {%- if s.metrics %}
                     <div class="metric-row">
-                        <div class="metric"><div class="mv" style="color:#e94560">60</div><div class="ml">Pages</div></div>
-                        <div class="metric"><div class="mv" style="color:#e94560">3</div><div class="ml">Formats</div></div>
+                        {%- for value, caption in s.metrics %}
+                        <div class="metric"><div class="mv">{{ value }}</div><div class="ml">{{ caption }}</div></div>
+                        {%- endfor %}
                     </div>
-                </div>
-                <div class="slide-num">09</div>
-            </div>
-
-            <!-- Slide 10: Timeline -->
-            <div class="slide theme-corp">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="line" style="width:80%;bottom:40px;left:10%;background:#e94560"></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">TIMELINE</span>
-                    <h4>10-Week Plan</h4>
-                    <div class="divider"></div>
+                    {%- endif %}
+                    {%- if s.timeline %}
                     <div class="timeline-row">
-                        <div class="tl-step" style="--c:#e94560"><span>Wk 1-2<br><strong style="color:#e94560">Discovery</strong></span></div>
-                        <div class="tl-step" style="--c:#e94560"><span>Wk 3-4<br><strong style="color:#e94560">Concepts</strong></span></div>
-                        <div class="tl-step" style="--c:#e94560"><span>Wk 5-6<br><strong style="color:#e94560">Refine</strong></span></div>
-                        <div class="tl-step" style="--c:#e94560"><span>Wk 7-8<br><strong style="color:#e94560">Build</strong></span></div>
-                        <div class="tl-step" style="--c:#e94560"><span>Wk 9-10<br><strong style="color:#e94560">Handoff</strong></span></div>
+                        {%- for when, what in s.timeline %}
+                        <div class="tl-step"{% if s.tl_color %} style="--c:{{ s.tl_color }}"{% endif %}><span>{{ when }}<br><strong>{{ what }}</strong></span></div>
+                        {%- endfor %}
                     </div>
-                </div>
-                <div class="slide-num">10</div>
-            </div>
-
-            <!-- Slide 11: Investment -->
-            <div class="slide theme-corp-alt">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="corner br" style="color:#e94560"></div>
-                    <div class="dots" style="left:16px;bottom:16px;color:#e94560"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div>
-                </div>
-                <div class="slide-inner">
-                    <span class="slide-label">INVESTMENT</span>
-                    <h4>Full Package</h4>
-                    <div class="divider"></div>
-                    <div class="metric-row">
-                        <div class="metric"><div class="mv" style="color:#e94560">50%</div><div class="ml">Upfront</div></div>
-                        <div class="metric"><div class="mv" style="color:#e94560">25%</div><div class="ml">Concepts</div></div>
-                        <div class="metric"><div class="mv" style="color:#e94560">25%</div><div class="ml">Delivery</div></div>
+                    {%- endif %}
+                    {%- if s.swatches %}
+                    <div class="swatch-row">
+                        {%- for color in s.swatches %}<i style="--c:{{ color }}"></i>{% endfor -%}
                     </div>
-                    <p style="margin-top:8px;font-size:10px">Includes 3 revision rounds per phase</p>
+                    {%- endif %}
+                    {%- if s.extra %}
+                    {{ s.extra|safe }}
+                    {%- endif %}
                 </div>
-                <div class="slide-num">11</div>
+                {%- endif %}
+                <div class="slide-num">{{ '%02d' % num }}</div>
             </div>
-
-            <!-- Slide 12: Thank You -->
-            <div class="slide theme-corp-dark">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#e94560"></div>
-                    <div class="corner br" style="color:#e94560"></div>
-                    <div class="circle" style="width:240px;height:240px;left:50%;top:50%;transform:translate(-50%,-50%);background:#e94560;opacity:.04"></div>
-                </div>
-                <div class="slide-inner slide-end">
-                    <h4>Let's Create<br>Something Beautiful</h4>
-                    <div class="divider" style="margin:10px auto"></div>
-                    <span class="contact">hello@bloomstudio.in<br>+91 98765 43210</span>
-                    <span class="tag" style="margin-top:12px">BLOOM STUDIO</span>
-                </div>
-                <div class="slide-num">12</div>
-            </div>
-        </div>
-    </div>
-    <div class="proposal-foot">
-        <div class="pf-tags">
-            <span class="pf-tag">📄 12 slides</span>
-            <span class="pf-tag">🏢 Corporate</span>
-            <span class="pf-tag">🔤 Aptos</span>
-        </div>
-        <a href="/">Recreate this →</a>
-    </div>
-</div>
-
-<!-- ═══ PROPOSAL 2: Wedding Decor ═══ -->
+{%- endmacro %}
+{% for p in proposals %}
 <div class="proposal">
-    <div class="proposal-label" style="color:#f5c6a5">● PROPOSAL 02</div>
-    <div class="proposal-head theme-wedding">
+    <div class="proposal-label" style="color:{{ p.accent }}">● PROPOSAL {{ '%02d' % loop.index }}</div>
+    <div class="proposal-head {{ p.head }}">
         <div class="ph-left">
-            <h3>Wedding Decor — Lotus Theme Collection</h3>
+            <h3>{{ p.title }}</h3>
             <div class="ph-meta">
-                <span>Bloom Studio → Priya &amp; Arjun</span>
+                {%- for m in p.meta %}
+                {%- if not loop.first %}
                 <span class="sep">·</span>
-                <span>Jan 22, 2026</span>
-                <span class="sep">·</span>
-                <span>8 slides</span>
+                {%- endif %}
+                <span>{{ m }}</span>
+                {%- endfor %}
             </div>
         </div>
         <div class="ph-right">
-            <div class="price" style="font-size:13px;color:var(--accent2)">8 Slides</div>
-            <span class="status accepted">Accepted</span>
+            <div class="price" style="font-size:13px;color:var(--accent2)">{{ p.price }}</div>
+            <span class="status {{ p.status|lower }}">{{ p.status }}</span>
         </div>
     </div>
     <div class="scroll-hint"><span>Scroll slides</span> <span class="arrow">→</span></div>
     <div class="slides-wrapper">
         <div class="slides-scroll">
-            <div class="slide theme-wed">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#f5c6a5"></div>
-                    <div class="corner br" style="color:#f5c6a5"></div>
-                    <div class="circle" style="width:180px;height:180px;right:-50px;bottom:-50px;background:#c62a88"></div>
-                </div>
-                <div class="slide-inner slide-title">
-                    <span class="tag">CREATIVE PITCH</span>
-                    <h4 style="color:#f5c6a5;margin-top:12px">Lotus Theme<br>Collection</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88);margin:8px auto"></div>
-                    <p style="color:#eee;font-size:12px">A bespoke wedding experience for <strong>Priya &amp; Arjun</strong></p>
-                    <span class="company-from" style="color:#d4a9b8">BY BLOOM STUDIO</span>
-                </div>
-                <div class="slide-num">01</div>
-            </div>
-            <div class="slide theme-wed-alt">
-                <div class="slide-deco"><div class="corner tl" style="color:#f5c6a5"></div><div class="dots" style="right:16px;bottom:16px;color:#f5c6a5"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#f5c6a5">YOUR VISION</span>
-                    <h4>Modern Tradition</h4>
-                    <div class="divider"></div>
-                    <p>A celebration that honors tradition while feeling intimate, modern, and uniquely yours. Lotus symbolism woven throughout every detail.</p>
-                </div>
-                <div class="slide-num">02</div>
-            </div>
-            <div class="slide theme-wed-accent">
-                <div class="slide-deco"><div class="corner tl" style="color:#f5c6a5"></div><div class="corner br" style="color:#f5c6a5"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#f5c6a5">CENTREPIECE</span>
-                    <h4>Mandap Design</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88)"></div>
-                    <p>Hand-carved wooden structure with cascading lotus garlands, silk draping in ivory and blush, and hanging brass diyas creating warm, ambient glow.</p>
-                </div>
-                <div class="slide-num">03</div>
-            </div>
-            <div class="slide theme-wed">
-                <div class="slide-deco"><div class="circle" style="width:100px;height:100px;left:-30px;top:-30px;background:#c62a88"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#f5c6a5">DETAILS</span>
-                    <h4>Table Settings</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88)"></div>
-                    <ul class="slide-list">
-                        <li style="--c:#f5c6a5">Brass lotus candle holders</li>
-                        <li style="--c:#f5c6a5">Hand-painted menu cards</li>
-                        <li style="--c:#f5c6a5">Silk Rajasthani block-print runners</li>
-                        <li style="--c:#f5c6a5">Fresh flower rangoli</li>
-                    </ul>
-                </div>
-                <div class="slide-num">04</div>
-            </div>
-            <div class="slide theme-wed-alt">
-                <div class="slide-deco"><div class="corner tl" style="color:#f5c6a5"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#f5c6a5">ENTRANCE</span>
-                    <h4>Welcome Arch</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88)"></div>
-                    <p>12-foot arch with woven jasmine and marigold base, oversized paper lotus blooms, and warm LED fairy lights creating a magical first impression.</p>
-                </div>
-                <div class="slide-num">05</div>
-            </div>
-            <div class="slide theme-wed-accent">
-                <div class="slide-deco"><div class="dots" style="left:16px;bottom:16px;color:#f5c6a5"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#f5c6a5">AMBIENCE</span>
-                    <h4>Lighting Design</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88)"></div>
-                    <p>Warm amber uplighting, floating lotus candles in water features, vintage brass lanterns along pathways, and canopy fairy lights.</p>
-                </div>
-                <div class="slide-num">06</div>
-            </div>
-            <div class="slide theme-wed">
-                <div class="slide-deco"><div class="corner tl" style="color:#f5c6a5"></div><div class="corner br" style="color:#f5c6a5"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#f5c6a5">INVESTMENT</span>
-                    <h4>Complete Package</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88)"></div>
-                    <p>Complete package including setup, all materials, lighting, day-of coordination, and breakdown. Travel within Jaipur included.</p>
-                    <div class="metric-row">
-                        <div class="metric"><div class="mv" style="color:#f5c6a5">40%</div><div class="ml">Booking</div></div>
-                        <div class="metric"><div class="mv" style="color:#f5c6a5">60%</div><div class="ml">Event Day</div></div>
-                    </div>
-                </div>
-                <div class="slide-num">07</div>
-            </div>
-            <div class="slide theme-wed-accent">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#f5c6a5"></div><div class="corner br" style="color:#f5c6a5"></div>
-                    <div class="circle" style="width:200px;height:200px;left:50%;top:50%;transform:translate(-50%,-50%);background:#c62a88;opacity:.06"></div>
-                </div>
-                <div class="slide-inner slide-end">
-                    <h4 style="color:#f5c6a5">Let's Make Your<br>Day Magical ✨</h4>
-                    <div class="divider" style="background:linear-gradient(90deg,#f5c6a5,#c62a88);margin:10px auto"></div>
-                    <span class="contact" style="color:#d4a9b8">hello@bloomstudio.in<br>+91 98765 43210</span>
-                </div>
-                <div class="slide-num">08</div>
-            </div>
+            {%- for s in p.slides %}{{ slide(s, loop.index) }}{% endfor %}
         </div>
     </div>
     <div class="proposal-foot">
         <div class="pf-tags">
-            <span class="pf-tag">📄 8 slides</span>
-            <span class="pf-tag">💒 Creative Pitch</span>
-            <span class="pf-tag">🌸 Warm Tone</span>
+            {%- for icon, tag in p.tags %}
+            <span class="pf-tag"><svg><use href="#ic-{{ icon }}"/></svg>{{ tag }}</span>
+            {%- endfor %}
         </div>
         <a href="/">Recreate this →</a>
     </div>
 </div>
-
-<!-- ═══ PROPOSAL 3: Corporate Workshop ═══ -->
-<div class="proposal">
-    <div class="proposal-label" style="color:#64ffda">● PROPOSAL 03</div>
-    <div class="proposal-head theme-workshop">
-        <div class="ph-left">
-            <h3>Corporate Art Workshop — Q1 Team Building</h3>
-            <div class="ph-meta">
-                <span>Bloom Studio → TechNova Solutions</span>
-                <span class="sep">·</span>
-                <span>Feb 14, 2026</span>
-                <span class="sep">·</span>
-                <span>6 slides</span>
-            </div>
-        </div>
-        <div class="ph-right">
-            <div class="price" style="font-size:13px;color:var(--accent2)">10 Slides</div>
-            <span class="status draft">Draft</span>
-        </div>
-    </div>
-    <div class="scroll-hint"><span>Scroll slides</span> <span class="arrow">→</span></div>
-    <div class="slides-wrapper">
-        <div class="slides-scroll">
-            <div class="slide theme-wk">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#64ffda"></div>
-                    <div class="corner br" style="color:#64ffda"></div>
-                    <div class="circle" style="width:180px;height:180px;right:-50px;bottom:-50px;background:#64ffda"></div>
-                </div>
-                <div class="slide-inner slide-title">
-                    <span class="tag">CORPORATE PROPOSAL</span>
-                    <h4 style="color:#64ffda;margin-top:12px">Art &amp; Team<br>Workshop</h4>
-                    <div class="divider" style="background:#64ffda;margin:8px auto"></div>
-                    <p style="color:#ccd6f6;font-size:12px">Prepared for <strong>TechNova Solutions</strong></p>
-                    <span class="company-from" style="color:#64ffda">Q1 TEAM BUILDING</span>
-                </div>
-                <div class="slide-num">01</div>
-            </div>
-            <div class="slide theme-wk-alt">
-                <div class="slide-deco"><div class="corner tl" style="color:#64ffda"></div><div class="dots" style="right:16px;bottom:16px;color:#64ffda"><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span><span></span></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#64ffda">WHY ART?</span>
-                    <h4>Creative Impact</h4>
-                    <div class="divider" style="background:#64ffda"></div>
-                    <p>Creative activities boost lateral thinking, reduce stress, and build trust between team members in ways traditional offsites can't match.</p>
-                    <div class="metric-row">
-                        <div class="metric"><div class="mv" style="color:#64ffda">40%</div><div class="ml">Creativity ↑</div></div>
-                        <div class="metric"><div class="mv" style="color:#64ffda">67%</div><div class="ml">Team Trust ↑</div></div>
-                    </div>
-                </div>
-                <div class="slide-num">02</div>
-            </div>
-            <div class="slide theme-wk-accent">
-                <div class="slide-deco"><div class="corner tl" style="color:#64ffda"></div><div class="corner br" style="color:#64ffda"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#64ffda">THE EXPERIENCE</span>
-                    <h4>3-Hour Session</h4>
-                    <div class="divider" style="background:#64ffda"></div>
-                    <div class="timeline-row">
-                        <div class="tl-step"><span>45 min<br><strong style="color:#64ffda">Basics</strong></span></div>
-                        <div class="tl-step"><span>60 min<br><strong style="color:#64ffda">Guided</strong></span></div>
-                        <div class="tl-step"><span>75 min<br><strong style="color:#64ffda">Mural</strong></span></div>
-                        <div class="tl-step"><span>Gallery<br><strong style="color:#64ffda">Walk</strong></span></div>
-                    </div>
-                </div>
-                <div class="slide-num">03</div>
-            </div>
-            <div class="slide theme-wk">
-                <div class="slide-deco"><div class="circle" style="width:120px;height:120px;left:-30px;bottom:-30px;background:#64ffda"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#64ffda">INCLUDED</span>
-                    <h4>What's Provided</h4>
-                    <div class="divider" style="background:#64ffda"></div>
-                    <ul class="slide-list">
-                        <li style="--c:#64ffda">All materials (brushes, paints, canvas)</li>
-                        <li style="--c:#64ffda">2 professional art instructors</li>
-                        <li style="--c:#64ffda">Aprons for all participants</li>
-                        <li style="--c:#64ffda">4×6ft collaborative canvas</li>
-                        <li style="--c:#64ffda">Framing for individual works</li>
-                    </ul>
-                </div>
-                <div class="slide-num">04</div>
-            </div>
-            <div class="slide theme-wk-alt">
-                <div class="slide-deco"><div class="corner tl" style="color:#64ffda"></div><div class="corner br" style="color:#64ffda"></div></div>
-                <div class="slide-inner">
-                    <span class="slide-label" style="color:#64ffda">INVESTMENT</span>
-                    <h4>Starter Package</h4>
-                    <div class="divider" style="background:#64ffda"></div>
-                    <p>For up to 25 participants. Includes all materials, instruction, venue setup, and a finished mural for your office wall.</p>
-                    <div class="metric-row">
-                        <div class="metric"><div class="mv" style="color:#64ffda">25</div><div class="ml">Max People</div></div>
-                        <div class="metric"><div class="mv" style="color:#64ffda">3hr</div><div class="ml">Duration</div></div>
-                    </div>
-                </div>
-                <div class="slide-num">05</div>
-            </div>
-            <div class="slide theme-wk-accent">
-                <div class="slide-deco">
-                    <div class="corner tl" style="color:#64ffda"></div><div class="corner br" style="color:#64ffda"></div>
-                    <div class="circle" style="width:200px;height:200px;left:50%;top:50%;transform:translate(-50%,-50%);background:#64ffda;opacity:.04"></div>
-                </div>
-                <div class="slide-inner slide-end">
-                    <h4 style="color:#64ffda">Let's Create<br>Together 🎨</h4>
-                    <div class="divider" style="background:#64ffda;margin:10px auto"></div>
-                    <span class="contact" style="color:#8892b0">hello@bloomstudio.in<br>+91 98765 43210</span>
-                    <span class="tag" style="margin-top:12px">BLOOM STUDIO</span>
-                </div>
-                <div class="slide-num">06</div>
-            </div>
-        </div>
-    </div>
-    <div class="proposal-foot">
-        <div class="pf-tags">
-            <span class="pf-tag">📄 6 slides</span>
-            <span class="pf-tag">🏢 Corporate</span>
-            <span class="pf-tag">🎨 Creative</span>
-        </div>
-        <a href="/">Recreate this →</a>
-    </div>
-</div>
-
+{% endfor %}
 </div>
 
-<style>
-.slide-list li::before{background:var(--c, #888)}
-.tl-step::before{background:var(--c, #888)}
-.tl-step::after{background:var(--c, #888)}
-</style>
 </body></html>'''
+
+# ── Demo Gallery Data ─────────────────────────────────────────
+# Sample decks for /demo-gallery, rendered by the slide() macro in DEMO_GALLERY_HTML.
+# kind "title"/"end" slides use the centered layouts; the rest are label + heading + body.
+# deco items are a corner class, or (class, style[, dot rows]) for circles, lines and dots.
+GALLERY_PROPOSALS = [
+    {"accent": "#e94560", "head": "theme-corporate", "title": "Brand Identity Package",
+     "meta": ["Bloom Studio → Varnam Artboutique", "Feb 10, 2026", "12 slides"],
+     "price": "12 Slides", "status": "Sent", "tags": [("page", "12 slides"), ("building", "Corporate"), ("type", "Aptos")],
+     "slides": [
+        {"theme": "theme-corp", "kind": "title",
+         "deco": ["corner tl", "corner br", ("circle", "width:200px;height:200px;right:-60px;bottom:-60px"),
+                  ("line", "width:60%;bottom:30%;left:20%;background:linear-gradient(90deg,transparent,#e94560,transparent)")],
+         "tag": "CORPORATE PROPOSAL", "title": "Brand Identity<br>Package",
+         "sub": "Prepared for <strong>Varnam Artboutique</strong>", "sub_color": "#eee",
+         "from": "BY BLOOM STUDIO"},
+        {"theme": "theme-corp-alt", "deco": ["corner tl", ("dots", "right:16px;bottom:16px", 3)],
+         "label": "THE CHALLENGE", "title": "Why Rebrand Now?",
+         "text": "Varnam Artboutique is expanding into international markets. Current branding doesn't reflect their premium positioning or rich cultural heritage. Competitors are investing heavily in design.",
+         "metrics": [("73%", "Need Update"), ("2.4×", "Brand Recall")]},
+        {"theme": "theme-corp-accent",
+         "deco": ["corner tl", "corner br", ("circle", "width:120px;height:120px;left:-30px;top:-30px")],
+         "label": "OUR APPROACH", "title": "6-Phase Process",
+         "list": ["Discovery & Brand Audit", "Concept Development", "Visual Design System",
+                  "Brand Guidelines", "Collateral Design", "Handoff & Training"]},
+        {"theme": "theme-corp", "deco": [("dots", "left:16px;top:16px"), ("line", "width:40%;top:50%;right:0")],
+         "label": "DELIVERABLE", "title": "Logo Redesign",
+         "text": "Modern mark blending Madhubani art motifs with contemporary typography. Primary, secondary, and icon variations.",
+         "extra": '<div class="icon-row"><span>🎨</span><span>✏️</span><span>📐</span></div>'},
+        {"theme": "theme-corp-alt",
+         "deco": ["corner tl", ("circle", "width:80px;height:80px;right:20px;top:20px;background:#c62a88;opacity:.12"),
+                  ("circle", "width:60px;height:60px;right:60px;top:50px;opacity:.1")],
+         "label": "VISUAL SYSTEM", "title": "Color Palette",
+         "text": "Rich earth tones paired with vibrant accents inspired by traditional Indian textiles and natural dyes.",
+         "swatches": ["#e94560", "#c62a88", "#0f3460", "#f5c6a5", "#1a1a2e"]},
+        {"theme": "theme-corp-accent", "deco": ["corner br"],
+         "label": "VISUAL SYSTEM", "title": "Typography",
+         "extra": '''<div style="margin-top:4px">
+                        <div style="font-family:'Playfair Display',serif;font-size:18px;color:#fff;font-weight:700">Aa Heading</div>
+                        <div style="font-size:10px;opacity:.5;margin-bottom:6px">Playfair Display · Serif</div>
+                        <div style="font-family:'DM Sans',sans-serif;font-size:12px;color:#ccc">Aa Body text sample</div>
+                        <div style="font-size:10px;opacity:.5;margin-bottom:6px">DM Sans · Sans-serif</div>
+                        <div style="font-size:12px;color:#ccc">आ देवनागरी</div>
+                        <div style="font-size:10px;opacity:.5">Matching Hindi family</div>
+                    </div>'''},
+        {"theme": "theme-corp", "deco": [("dots", "right:16px;top:16px"), "corner tl"],
+         "label": "DELIVERABLES", "title": "Collateral Design",
+         "list": ["Business cards & letterhead", "Packaging inserts & labels", "Exhibition banners (3 sizes)",
+                  "Social media templates", "WhatsApp catalog design"]},
+        {"theme": "theme-corp-alt", "deco": ["corner tl", "corner br"],
+         "label": "DIGITAL", "title": "Online Presence",
+         "text": "Website UI kit, email templates, Instagram grid layout, Google Business profile assets, and e-commerce product page templates."},
+        {"theme": "theme-corp-accent", "deco": [("circle", "width:160px;height:160px;right:-40px;bottom:-40px")],
+         "label": "DELIVERABLE", "title": "Brand Guidelines",
+         "text": "60-page comprehensive guide: logo usage, do's & don'ts, spacing rules, color specs (CMYK, RGB, Pantone), voice & tone.",
+         "metrics": [("60", "Pages"), ("3", "Formats")]},
+        {"theme": "theme-corp", "deco": ["corner tl", ("line", "width:80%;bottom:40px;left:10%")],
+         "label": "TIMELINE", "title": "10-Week Plan", "tl_color": "#e94560",
+         "timeline": [("Wk 1-2", "Discovery"), ("Wk 3-4", "Concepts"), ("Wk 5-6", "Refine"),
+                      ("Wk 7-8", "Build"), ("Wk 9-10", "Handoff")]},
+        {"theme": "theme-corp-alt", "deco": ["corner tl", "corner br", ("dots", "left:16px;bottom:16px")],
+         "label": "INVESTMENT", "title": "Full Package",
+         "metrics": [("50%", "Upfront"), ("25%", "Concepts"), ("25%", "Delivery")],
+         "extra": '<p style="margin-top:8px;font-size:10px">Includes 3 revision rounds per phase</p>'},
+        {"theme": "theme-corp-dark", "kind": "end",
+         "deco": ["corner tl", "corner br",
+                  ("circle", "width:240px;height:240px;left:50%;top:50%;transform:translate(-50%,-50%);opacity:.04")],
+         "title": "Let's Create<br>Something Beautiful", "tag": "BLOOM STUDIO"},
+    ]},
+    {"accent": "#f5c6a5", "head": "theme-wedding", "title": "Wedding Decor — Lotus Theme Collection",
+     "meta": ["Bloom Studio → Priya & Arjun", "Jan 22, 2026", "8 slides"],
+     "price": "8 Slides", "status": "Accepted", "tags": [("page", "8 slides"), ("ring", "Creative Pitch"), ("flower", "Warm Tone")],
+     "slides": [
+        {"theme": "theme-wed", "kind": "title",
+         "deco": ["corner tl", "corner br", ("circle", "width:180px;height:180px;right:-50px;bottom:-50px")],
+         "tag": "CREATIVE PITCH", "title": "Lotus Theme<br>Collection",
+         "sub": "A bespoke wedding experience for <strong>Priya &amp; Arjun</strong>", "sub_color": "#eee",
+         "from": "BY BLOOM STUDIO", "from_style": "color:#d4a9b8"},
+        {"theme": "theme-wed-alt", "deco": ["corner tl", ("dots", "right:16px;bottom:16px")],
+         "label": "YOUR VISION", "title": "Modern Tradition",
+         "text": "A celebration that honors tradition while feeling intimate, modern, and uniquely yours. Lotus symbolism woven throughout every detail."},
+        {"theme": "theme-wed-accent", "deco": ["corner tl", "corner br"],
+         "label": "CENTREPIECE", "title": "Mandap Design",
+         "text": "Hand-carved wooden structure with cascading lotus garlands, silk draping in ivory and blush, and hanging brass diyas creating warm, ambient glow."},
+        {"theme": "theme-wed", "deco": [("circle", "width:100px;height:100px;left:-30px;top:-30px")],
+         "label": "DETAILS", "title": "Table Settings",
+         "list": ["Brass lotus candle holders", "Hand-painted menu cards", "Silk Rajasthani block-print runners",
+                  "Fresh flower rangoli"]},
+        {"theme": "theme-wed-alt", "deco": ["corner tl"],
+         "label": "ENTRANCE", "title": "Welcome Arch",
+         "text": "12-foot arch with woven jasmine and marigold base, oversized paper lotus blooms, and warm LED fairy lights creating a magical first impression."},
+        {"theme": "theme-wed-accent", "deco": [("dots", "left:16px;bottom:16px")],
+         "label": "AMBIENCE", "title": "Lighting Design",
+         "text": "Warm amber uplighting, floating lotus candles in water features, vintage brass lanterns along pathways, and canopy fairy lights."},
+        {"theme": "theme-wed", "deco": ["corner tl", "corner br"],
+         "label": "INVESTMENT", "title": "Complete Package",
+         "text": "Complete package including setup, all materials, lighting, day-of coordination, and breakdown. Travel within Jaipur included.",
+         "metrics": [("40%", "Booking"), ("60%", "Event Day")]},
+        {"theme": "theme-wed-accent", "kind": "end",
+         "deco": ["corner tl", "corner br",
+                  ("circle", "width:200px;height:200px;left:50%;top:50%;transform:translate(-50%,-50%);opacity:.06")],
+         "title": "Let's Make Your<br>Day Magical ✨", "contact_style": "color:#d4a9b8"},
+    ]},
+    {"accent": "#64ffda", "head": "theme-workshop", "title": "Corporate Art Workshop — Q1 Team Building",
+     "meta": ["Bloom Studio → TechNova Solutions", "Feb 14, 2026", "6 slides"],
+     "price": "10 Slides", "status": "Draft", "tags": [("page", "6 slides"), ("building", "Corporate"), ("palette", "Creative")],
+     "slides": [
+        {"theme": "theme-wk", "kind": "title",
+         "deco": ["corner tl", "corner br", ("circle", "width:180px;height:180px;right:-50px;bottom:-50px")],
+         "tag": "CORPORATE PROPOSAL", "title": "Art &amp; Team<br>Workshop",
+         "sub": "Prepared for <strong>TechNova Solutions</strong>", "sub_color": "#ccd6f6",
+         "from": "Q1 TEAM BUILDING", "from_style": "color:#64ffda"},
+        {"theme": "theme-wk-alt", "deco": ["corner tl", ("dots", "right:16px;bottom:16px")],
+         "label": "WHY ART?", "title": "Creative Impact",
+         "text": "Creative activities boost lateral thinking, reduce stress, and build trust between team members in ways traditional offsites can't match.",
+         "metrics": [("40%", "Creativity ↑"), ("67%", "Team Trust ↑")]},
+        {"theme": "theme-wk-accent", "deco": ["corner tl", "corner br"],
+         "label": "THE EXPERIENCE", "title": "3-Hour Session",
+         "timeline": [("45 min", "Basics"), ("60 min", "Guided"), ("75 min", "Mural"), ("Gallery", "Walk")]},
+        {"theme": "theme-wk", "deco": [("circle", "width:120px;height:120px;left:-30px;bottom:-30px")],
+         "label": "INCLUDED", "title": "What's Provided",
+         "list": ["All materials (brushes, paints, canvas)", "2 professional art instructors",
+                  "Aprons for all participants", "4×6ft collaborative canvas", "Framing for individual works"]},
+        {"theme": "theme-wk-alt", "deco": ["corner tl", "corner br"],
+         "label": "INVESTMENT", "title": "Starter Package",
+         "text": "For up to 25 participants. Includes all materials, instruction, venue setup, and a finished mural for your office wall.",
+         "metrics": [("25", "Max People"), ("3hr", "Duration")]},
+        {"theme": "theme-wk-accent", "kind": "end",
+         "deco": ["corner tl", "corner br",
+                  ("circle", "width:200px;height:200px;left:50%;top:50%;transform:translate(-50%,-50%);opacity:.04")],
+         "title": "Let's Create<br>Together 🎨", "contact_style": "color:#8892b0", "tag": "BLOOM STUDIO"},
+    ]},
+]
+
+# Static apart from HUB_URL, which is fixed for the life of the process — render once at import
+GALLERY_CSS = prerender(minify_css(GALLERY_DEFERRED_CSS))
+GALLERY_CSS_HASH = GALLERY_CSS[3][:10]
+def page_glyphs(html):
+    """Every character a static page can show (plus uppercase forms for text-transform), for Google Fonts' text= subsetting"""
+    text = unescape(re.sub(r"<style>.*?</style>|<script>.*?</script>|<[^>]+>", "", html, flags=re.S))
+    return "".join(sorted(set(text + text.upper()) - set("\n\r\t")))
+
+def render_gallery(font_text=''):
+    """Demo gallery HTML; font_text, when given, subsets the webfont request to those characters"""
+    return app.jinja_env.from_string(DEMO_GALLERY_HTML).render(
+        hub_url=os.environ.get('HUB_URL', 'https://snapsuite.up.railway.app'), proposals=GALLERY_PROPOSALS,
+        critical_css=GALLERY_CRITICAL_CSS, css_hash=GALLERY_CSS_HASH, font_text=font_text)
+
+# The page text is fixed, so the webfonts are requested subset to just its glyphs (a few KB, not ~80KB each)
+GALLERY_PAGE = prerender(render_gallery(page_glyphs(render_gallery())))
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    app.logger.info(f"🎯 ProposalSnap is running — open http://localhost:{port}")
+    # Debugger and reloader only in development; under gunicorn (start.py) this block never runs
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_ENV') == 'development', threaded=True)
@@ -5,17 +5,23 @@
 const pptxgen = require("pptxgenjs");
 const fs = require("fs");
 
-let inputData = "";
-process.stdin.on("data", chunk => inputData += chunk);
-process.stdin.on("end", async () => {
-  try {
-    const data = JSON.parse(inputData);
-    await generatePresentation(data);
-  } catch (e) {
-    console.error("Error:", e.message);
-    process.exit(1);
-  }
-});
+// One-shot CLI: read a single JSON job from stdin (pptx_worker.js reuses the module)
+if (require.main === module) {
+  let inputData = "";
+  process.stdin.on("data", chunk => inputData += chunk);
+  process.stdin.on("end", async () => {
+    try {
+      const data = JSON.parse(inputData);
+      await generatePresentation(data);
+      console.log("OK:" + data.outputPath);
+    } catch (e) {
+      console.error("Error:", e.message);
+      process.exit(1);
+    }
+  });
+}
+
+module.exports = { generatePresentation };
 
 async function generatePresentation(data) {
   const {
@@ -676,6 +682,8 @@ async function generatePresentation(data) {
     }
   });
 
+  // No outputPath: hand the deck back as a Buffer (the worker pipes it to Python)
+  if (!outputPath) return pres.write({ outputType: "nodebuffer" });
   await pres.writeFile({ fileName: outputPath });
-  console.log("OK:" + outputPath);
+  return outputPath;
 }
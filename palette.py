@@ -0,0 +1,138 @@
+"""
+ProposalSnap - logo palette extraction
+======================================
+Decode a logo and derive the deck palette from its most vivid color. Kept apart
+from app.py so cpu_pool's forkserver children import only this (no Flask, DB,
+threads or Node workers).
+"""
+
+from io import BytesIO
+
+import numpy as np
+from PIL import Image, ImageFile
+
+# Logos: decode what's there of a truncated upload, refuse decompression bombs, and register
+# every codec plugin now rather than on the first upload
+ImageFile.LOAD_TRUNCATED_IMAGES = True
+Image.MAX_IMAGE_PIXELS = 25_000_000
+Image.init()
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    turbo_jpeg = TurboJPEG()  # raises if libturbojpeg isn't on the system
+except Exception:
+    turbo_jpeg = None
+
+# JPEG decode target: 2x the 64px analysis thumbnail, so a 3000px logo decodes at 1/8 scale
+DECODE_SIZE = 128
+
+def _decode_logo(data):
+    """Decode logo bytes to RGB at ~DECODE_SIZE px, via libjpeg-turbo for JPEGs when it's installed"""
+    if turbo_jpeg and data[:3] == b"\xff\xd8\xff":
+        try:
+            width, height = turbo_jpeg.decode_header(data)[:2]
+            # Same choice as PIL's draft(): the smallest DCT scale still >= DECODE_SIZE
+            denom = next((d for d in (8, 4, 2) if width // d >= DECODE_SIZE and height // d >= DECODE_SIZE), 1)
+            return Image.fromarray(turbo_jpeg.decode(data, pixel_format=TJPF_RGB, scaling_factor=(1, denom)))
+        except Exception:
+            pass  # CMYK and other oddities go through Pillow
+    img = Image.open(BytesIO(data))
+    img.draft("RGB", (DECODE_SIZE, DECODE_SIZE))  # JPEG: decode at reduced DCT scale
+    return img.convert("RGB")
+
+def compute_palette(data):
+    """Decode + palette math for raw logo bytes; app.py runs it in a cpu_pool process for all but tiny logos"""
+    img = Image.open(BytesIO(data))
+    if img.mode == "P" and (used := img.getcolors(256)):
+        # Palette PNG/GIF: the palette entries in use are the candidate colors, weighted by pixel count
+        counts, indexes = np.array(used).T
+        palette = np.array(img.getpalette("RGB"), dtype=np.uint8).reshape(-1, 3)
+        return _palette_from_pixels(palette[indexes], counts)
+    img = _decode_logo(data)
+    img.thumbnail((64, 64), Image.NEAREST)  # ~4k real source pixels; no blending to dull the vivid pick
+    return _palette_from_pixels(np.asarray(img).reshape(-1, 3))
+
+def _palette_from_pixels(pixels, counts=None):
+    """Palette from an (N,3) uint8 pixel array; counts weights each row when pixels are distinct colors"""
+
+    # Stay in integer lanes: one max/min per pixel answers every threshold below
+    cmax = pixels.max(axis=1).astype(np.int32)
+    cmin = pixels.min(axis=1).astype(np.int32)
+    chroma = cmax - cmin
+
+    # Filter out near-white, near-black, and very desaturated pixels:
+    # sat > 0.15, 0.1 < val < 0.95 with sat = chroma/cmax and val = cmax/255, cross-multiplied
+    mask = (20 * chroma > 3 * cmax) & (cmax > 25) & (cmax < 243)
+
+    if (np.count_nonzero(mask) if counts is None else counts[mask].sum()) < 10:
+        # All channels > 240 is just min > 240; all < 15 is max < 15
+        mask = ~((cmin > 240) | (cmax < 15))
+
+    if not mask.any():
+        return default_colors()
+
+    # Pick the most vivid color as primary: sat * val = chroma/cmax * cmax/255, so it's just max chroma
+    candidates = np.flatnonzero(mask)
+    if counts is None:
+        best = candidates[np.argmax(chroma[candidates])]
+    else:
+        best = candidates[np.lexsort((counts[candidates], chroma[candidates]))[-1]]  # chroma ties go to the commoner color
+    h, s, v = _rgb_to_hsv(*(int(c) for c in pixels[best]))
+    
+    primary_hex, secondary_hex, accent_hex, dark_hex = _derive_palette(h, s, v)
+    
+    return {
+        "primary": primary_hex,
+        "secondary": secondary_hex,
+        "accent": accent_hex,
+        "dark": dark_hex,
+        "light": "F8F9FA",
+        "textDark": "1A1A2E",
+        "textLight": "FFFFFF",
+        "textMuted": "6B7280"
+    }
+
+def _rgb_to_hsv(r, g, b):
+    """colorsys.rgb_to_hsv for one 0-255 pixel, with the same float operations so results are bit-identical"""
+    r, g, b = r / 255, g / 255, b / 255
+    maxc, minc = max(r, g, b), min(r, g, b)
+    if minc == maxc:
+        return 0.0, 0.0, maxc
+    rangec = maxc - minc
+    rc, gc, bc = (maxc - r) / rangec, (maxc - g) / rangec, (maxc - b) / rangec
+    if r == maxc:
+        h = bc - gc
+    elif g == maxc:
+        h = 2.0 + rc - bc
+    else:
+        h = 4.0 + gc - rc
+    return (h / 6.0) % 1.0, rangec / maxc, maxc
+
+def _derive_palette(h, s, v):
+    """Primary/secondary/accent/dark hexes from the vivid color's HSV, as one (4,3) op"""
+    hsv = np.array([
+        [h, max(0.5, s), max(0.35, min(0.75, v))],                  # primary: rich enough for headings
+        [h, max(0.05, s * 0.15), min(1.0, 0.92 + v * 0.06)],        # secondary: very light tint
+        [(h + 0.55) % 1.0, max(0.5, min(0.9, s)), max(0.45, min(0.85, v * 1.1))],  # accent: complementary hue
+        [h, min(0.5, s * 0.6), 0.12],                               # dark: for backgrounds
+    ])
+    hh, ss, vv = hsv.T
+    # HSV -> RGB (colorsys.hsv_to_rgb's sector switch), vectorized over the four rows
+    i = np.floor(hh * 6.0)
+    f = hh * 6.0 - i
+    p = vv * (1.0 - ss)
+    q = vv * (1.0 - ss * f)
+    t = vv * (1.0 - ss * (1.0 - f))
+    i = (i.astype(int) % 6)[:, None]
+    rgb = np.select([i == 0, i == 1, i == 2, i == 3, i == 4],
+                    [np.stack([vv, t, p], 1), np.stack([q, vv, p], 1), np.stack([p, vv, t], 1),
+                     np.stack([p, q, vv], 1), np.stack([t, p, vv], 1)],
+                    np.stack([vv, p, q], 1))
+    raw = (rgb * 255).astype(np.uint8).tobytes().hex()
+    return [raw[k:k + 6] for k in range(0, 24, 6)]
+
+def default_colors():
+    return {
+        "primary": "1E2761", "secondary": "CADCFC", "accent": "4A90D9",
+        "dark": "0F1629", "light": "F8F9FA", "textDark": "1A1A2E",
+        "textLight": "FFFFFF", "textMuted": "6B7280"
+    }
@@ -0,0 +1,54 @@
+/**
+ * ProposalSnap PPTX Worker
+ * Long-lived process so each deck doesn't pay Node startup + pptxgenjs load.
+ * Protocol: 4-byte big-endian length, then a UTF-8 JSON body. Jobs arrive on
+ * stdin; replies go to the pipe fd given as argv[2] (stdout if omitted), so
+ * stray logging from dependencies can never corrupt a frame.
+ * Request body is the same job generate_pptx.js takes minus outputPath; the
+ * reply is a {ok, error?} JSON frame, followed by a raw PPTX frame when ok.
+ */
+const fs = require("fs");
+const { generatePresentation } = require("./generate_pptx");
+
+const outFd = Number(process.argv[2] || 1);
+const out = outFd === 1 ? process.stdout : fs.createWriteStream(null, { fd: outFd });
+
+let buffered = Buffer.alloc(0);
+let queue = Promise.resolve();
+
+function writeFrame(body) {
+  const header = Buffer.alloc(4);
+  header.writeUInt32BE(body.length, 0);
+  out.write(Buffer.concat([header, body]));
+}
+
+function reply(obj) {
+  writeFrame(Buffer.from(JSON.stringify(obj), "utf8"));
+}
+
+async function handle(frame) {
+  let pptx;
+  try {
+    const data = JSON.parse(frame.toString("utf8"));
+    delete data.outputPath;
+    pptx = await generatePresentation(data);
+  } catch (e) {
+    reply({ ok: false, error: e.message });
+    return;
+  }
+  reply({ ok: true });
+  writeFrame(pptx);
+}
+
+process.stdin.on("data", chunk => {
+  buffered = Buffer.concat([buffered, chunk]);
+  while (buffered.length >= 4) {
+    const size = buffered.readUInt32BE(0);
+    if (buffered.length < 4 + size) break;
+    const frame = buffered.subarray(4, 4 + size);
+    buffered = buffered.subarray(4 + size);
+    // Jobs run one at a time so replies stay in request order
+    queue = queue.then(() => handle(frame));
+  }
+});
+process.stdin.on("end", () => queue.then(() => process.exit(0)));
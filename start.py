@@ -3,9 +3,16 @@ import subprocess
 import sys
 
 port = os.environ.get("PORT", "5000")
-print(f"Starting on port {port}")
+workers = os.environ.get("WEB_CONCURRENCY", "2")
+threads = os.environ.get("WEB_THREADS", "8")
+print(f"Starting on port {port} ({workers} workers x {threads} threads)")
+# gthread: each worker serves requests on a thread pool, so a 15-30s Claude
+# call only ties up one thread instead of the whole worker
 subprocess.run([
     sys.executable, "-m", "gunicorn", "app:app",
     "--bind", f"0.0.0.0:{port}",
+    "--worker-class", "gthread",
+    "--workers", workers,
+    "--threads", threads,
     "--timeout", "120"
 ])